@@ -7,16 +7,30 @@ from INI files based on the environment retrieved from AWS SSM Parameter Store.
 import logging
 import configparser
 import os
-from typing import Dict, Any
+import re
+from typing import Dict, Any, Tuple
 
 from src.utils import ssm_utils
 
 logger = logging.getLogger(__name__)
 
+# Values configparser returns that should be converted to int
+_INT_RE = re.compile(r'[+-]?\d+')
+
+# Other bootstrap parameters fetched in the same GetParameters call as the environment;
+# their values are then served from ssm_utils' cache for the rest of the job
+BOOTSTRAP_PARAMETER_NAMES = ("talend/migration/region", "talend/migration/log_level")
+
+# Parsed INI files, keyed by (path, mtime in ns)
+_INI_CACHE: Dict[Tuple[str, int], Dict[str, Dict[str, Any]]] = {}
+
 def get_environment_from_ssm(parameter_name: str = "talend/migration/env", region_name: str = None) -> str:
     """
     Get the current environment from AWS SSM Parameter Store.
     
+    The environment is fetched together with BOOTSTRAP_PARAMETER_NAMES in one
+    GetParameters call, so later lookups of those parameters hit the SSM cache.
+    
     Args:
         parameter_name: SSM parameter name containing the environment
         region_name: AWS region name (optional)
@@ -28,8 +42,11 @@ def get_environment_from_ssm(parameter_name: str = "talend/migration/env", regio
         Exception: If unable to retrieve environment from SSM
     """
     try:
-        environment = ssm_utils.get_parameter(parameter_name, False, region_name)
-        environment = environment.lower().strip()
+        names = [parameter_name] + [name for name in BOOTSTRAP_PARAMETER_NAMES if name != parameter_name]
+        parameters = ssm_utils.get_parameters(names, False, region_name)
+        if parameter_name not in parameters:
+            raise KeyError(f"Parameter not found: {parameter_name}")
+        environment = parameters[parameter_name].lower().strip()
         
         if environment not in ['test', 'prod']:
             logger.warning(f"Invalid environment '{environment}' from SSM, defaulting to 'test'")
@@ -47,6 +64,8 @@ def load_ini_config(config_file_path: str) -> Dict[str, Any]:
     """
     Load configuration from an INI file and convert to dictionary.
     
+    The parsed result is cached until the file's modification time changes.
+    
     Args:
         config_file_path: Path to the INI configuration file
         
@@ -57,24 +76,26 @@ def load_ini_config(config_file_path: str) -> Dict[str, Any]:
         Exception: If unable to load configuration file
     """
     try:
-        config = configparser.ConfigParser()
-        config.read(config_file_path)
+        cache_key = (config_file_path, os.stat(config_file_path).st_mtime_ns)
+        result = _INI_CACHE.get(cache_key)
         
-        # Convert INI sections to nested dictionary
-        result = {}
-        for section in config.sections():
-            section_dict = {}
-            for key, value in config.items(section):
-                # Try to convert to int if possible
-                try:
-                    section_dict[key] = int(value)
-                except ValueError:
-                    # Keep as string if not an integer
-                    section_dict[key] = value
-            result[section] = section_dict
+        if result is None:
+            config = configparser.ConfigParser()
+            config.read(config_file_path)
+            
+            # Convert INI sections to nested dictionary, with integer values as int
+            result = {
+                section: {
+                    key: int(value) if _INT_RE.fullmatch(value) else value
+                    for key, value in config.items(section)
+                }
+                for section in config.sections()
+            }
+            _INI_CACHE[cache_key] = result
         
         logger.info(f"Loaded configuration from {config_file_path}")
-        return result
+        # Copy the sections so callers cannot modify the cached configuration
+        return {section: dict(values) for section, values in result.items()}
         
     except Exception as e:
         logger.error(f"Failed to load configuration from {config_file_path}: {str(e)}")
@@ -6,16 +6,21 @@ This module provides functionality to load context variables from configuration
 import os
 import logging
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
-from src.context import context
+from src.context import context, parse_properties
 
 logger = logging.getLogger(__name__)
 
+# Parsed context files, keyed by (path, mtime in ns), for drivers that re-run the joblet
+_CONTEXT_FILE_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
+
 def load_context_from_file(file_path: str) -> Dict[str, Any]:
     """
     Load context variables from a configuration file.
     
+    The parsed result is cached until the file's modification time changes.
+    
     Args:
         file_path: Path to the configuration file
         
@@ -26,20 +31,19 @@ def load_context_from_file(file_path: str) -> Dict[str, Any]:
         Exception: If the file cannot be read or parsed
     """
     try:
-        if not os.path.exists(file_path):
+        try:
+            f = open(file_path, 'r', encoding='utf-8', errors='replace')
+        except FileNotFoundError:
             logger.error(f"Context file not found: {file_path}")
             raise FileNotFoundError(f"Context file not found: {file_path}")
         
-        variables = {}
-        with open(file_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    variables[key.strip()] = value.strip()
+        with f:
+            stat = os.fstat(f.fileno())
+            cache_key = (file_path, stat.st_mtime_ns)
+            if cache_key not in _CONTEXT_FILE_CACHE:
+                # Parse every key=value line with a single regex pass
+                _CONTEXT_FILE_CACHE[cache_key] = parse_properties(f.read())
+        variables = dict(_CONTEXT_FILE_CACHE[cache_key])
         
         logger.info(f"Loaded {len(variables)} context variables from {file_path}")
         return variables
@@ -14,7 +14,7 @@ logger = logging.getLogger(__name__)
 
 def close_database_connections(pre_job_results: Dict[str, Any]) -> None:
     """
-    Close database connections.
+    Close database connections by returning them to the Redshift pool.
     
     Args:
         pre_job_results: Results from pre-job tasks
@@ -29,11 +29,11 @@ def close_database_connections(pre_job_results: Dict[str, Any]) -> None:
         
         # Close connections if they exist
         if datamart_conn:
-            datamart_conn.close()
+            redshift_utils.putconn(datamart_conn)
             logger.info("Closed Redshift datamart connection")
         
         if ods_conn:
-            ods_conn.close()
+            redshift_utils.putconn(ods_conn)
             logger.info("Closed Redshift ODS connection")
     except Exception as e:
         logger.error(f"Failed to close database connections: {str(e)}")
@@ -52,8 +52,8 @@ def run_post_job(pre_job_results: Dict[str, Any], main_job_results: Dict[str, An
         Exception: If post-job tasks fail
     """
     try:
-        # Run batch detail close job
-        batch_detail_close.run_main_job(config)
+        # Run batch detail close job on the datamart connection opened in the pre-job
+        batch_detail_close.run_main_job(config, pre_job_results.get("datamart_conn"))
         
         # Close database connections
         close_database_connections(pre_job_results)
@@ -3,6 +3,8 @@ Main job tasks for the Job_Frmwrk_EDW_BATCH_DETAIL_START job.
 
 This module contains functions for the main processing phase of the Job_Frmwrk_EDW_BATCH_DETAIL_START job.
 """
+import concurrent.futures
+import functools
 import logging
 from typing import Dict, Any, Optional
 
@@ -11,73 +13,92 @@ from src.utils import redshift_utils, ssm_utils
 
 logger = logging.getLogger(__name__)
 
-def get_batch_id(conn, subject_area_id: str) -> int:
+@functools.lru_cache(maxsize=1)
+def _ssm_names(env: str) -> Dict[str, str]:
     """
-    Get the batch ID for the job.
+    Build the Redshift SSM parameter names for an environment once.
+    
+    Args:
+        env: Environment name
+        
+    Returns:
+        Dictionary of the parent path and the host, port and database parameter names
+    """
+    return {
+        "path": f"/edo/{env}/redshift",
+        "host": f"/edo/{env}/redshift/host",
+        "port": f"/edo/{env}/redshift/port",
+        "database": f"/edo/{env}/redshift/database"
+    }
+
+def start_batch_detail(conn, subject_area_id: str, job_name: str, src_table_nm: str, tgt_table_nm: str) -> int:
+    """
+    Look up the in-progress batch ID and insert the batch audit detail record in one round-trip.
+    
+    The insert is skipped if the job already has an in-progress detail record for the batch,
+    so re-running after a retry is safe.
     
     Args:
         conn: Redshift connection
         subject_area_id: Subject area ID
+        job_name: Job name
+        src_table_nm: Source table name
+        tgt_table_nm: Target table name
         
     Returns:
         Batch ID
         
     Raises:
-        Exception: If the batch ID cannot be retrieved
+        Exception: If the batch ID cannot be retrieved or the record cannot be inserted
     """
     try:
-        query = f"""
+        # Redshift has no INSERT ... RETURNING, so the batch ID is read back by a
+        # trailing SELECT sent in the same batch. The NOT EXISTS guard keeps Glue
+        # retries from adding a second in-progress detail row for the same batch.
+        query = """
+        insert into edw_ods.batch_audit_detail (batch_id, job_nm, process_status_cd, batch_detail_start_ts, file_nm, src_table_nm, tgt_table_nm) 
+        with b as (
+        select max(batch_id) as batch_id from edw_ods.batch_audit
+        where process_status_cd='In Progress' and subject_area_id = %(subject_area_id)s
+        )
+        select b.batch_id, %(job_name)s, 'In Progress', current_timestamp, 'N/A', %(src_table_nm)s, %(tgt_table_nm)s
+        from b where b.batch_id is not null
+        and not exists (
+        select 1 from edw_ods.batch_audit_detail d
+        where d.batch_id = b.batch_id and d.job_nm = %(job_name)s and d.process_status_cd = 'In Progress'
+        );
         select max(batch_id) as batch_id from edw_ods.batch_audit
-        where process_status_cd='In Progress' and subject_area_id = {subject_area_id}
+        where process_status_cd='In Progress' and subject_area_id = %(subject_area_id)s;
         """
+        params = {
+            'subject_area_id': subject_area_id,
+            'job_name': job_name,
+            'src_table_nm': src_table_nm,
+            'tgt_table_nm': tgt_table_nm
+        }
         
-        result = redshift_utils.fetch_one(conn, query)
+        result = redshift_utils.fetch_one(conn, query, params, commit=True)
         
         if result and result[0]:
             batch_id = result[0]
-            logger.info(f"Retrieved batch ID: {batch_id}")
+            logger.info("Retrieved batch ID: %s", batch_id)
+            logger.info("Batch audit detail record in progress for job %s", job_name)
             return batch_id
         else:
             logger.error("No batch ID found")
             raise ValueError("No batch ID found")
     except Exception as e:
-        logger.error(f"Failed to get batch ID: {str(e)}")
+        logger.error("Failed to start batch audit detail record: %s", e)
         raise
 
-def insert_batch_audit_detail(conn, batch_id: int, job_name: str, src_table_nm: str, tgt_table_nm: str) -> None:
-    """
-    Insert a record into the batch audit detail table.
-    
-    Args:
-        conn: Redshift connection
-        batch_id: Batch ID
-        job_name: Job name
-        src_table_nm: Source table name
-        tgt_table_nm: Target table name
-        
-    Raises:
-        Exception: If the record cannot be inserted
-    """
-    try:
-        query = f"""
-        begin;
-        insert into edw_ods.batch_audit_detail (batch_id, job_nm, process_status_cd, batch_detail_start_ts, file_nm, src_table_nm, tgt_table_nm) 
-        values ({batch_id}, '{job_name}', 'In Progress', current_timestamp, 'N/A', '{src_table_nm}', '{tgt_table_nm}');
-        end;
-        """
-        
-        redshift_utils.execute_query(conn, query)
-        logger.info(f"Inserted batch audit detail record for job {job_name}")
-    except Exception as e:
-        logger.error(f"Failed to insert batch audit detail record: {str(e)}")
-        raise
-
-def run_main_job(config: Dict[str, Any]) -> Dict[str, Any]:
+def run_main_job(config: Dict[str, Any], conn=None) -> Dict[str, Any]:
     """
     Run main job tasks for the Job_Frmwrk_EDW_BATCH_DETAIL_START job.
     
     Args:
         config: Configuration dictionary
+        conn: Open Redshift datamart connection to reuse (optional); when omitted a
+            connection is taken from the pool and returned afterwards
         
     Returns:
         Dictionary of job results
@@ -86,32 +107,40 @@ def run_main_job(config: Dict[str, Any]) -> Dict[str, Any]:
         Exception: If main job tasks fail
     """
     try:
-        # Get database configuration
-        db_config = config.get('database', {}).get('redshift_datamart', {})
-        
-        # Get database connection parameters from SSM Parameter Store
-        host = ssm_utils.get_parameter("/edo/" + context.batch_env + "/redshift/host")
-        port = int(ssm_utils.get_parameter("/edo/" + context.batch_env + "/redshift/port"))
-        database = ssm_utils.get_parameter("/edo/" + context.batch_env + "/redshift/database")
-        user = db_config.get('user', 'edw_datamart_etl')
-        password = ssm_utils.get_parameter(db_config.get('parameter_store_path', '/edo/dev/redshift/datamart/edw_datamart_stg'), True)
-        
-        # Connect to Redshift
-        conn = redshift_utils.get_redshift_connection(host, port, database, user, password)
+        owns_conn = conn is None
+        if owns_conn:
+            # Get database configuration
+            db_config = config.get('database', {}).get('redshift_datamart', {})
+            
+            # Get database connection parameters from SSM Parameter Store; the password
+            # lookup is independent of the host/port/database lookup, so run them concurrently
+            names = _ssm_names(context.batch_env)
+            password_name = db_config.get('parameter_store_path', '/edo/dev/redshift/datamart/edw_datamart_stg')
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                password_future = executor.submit(ssm_utils.get_parameter, password_name, True)
+                # One GetParametersByPath call instead of three GetParameter calls
+                parameters = ssm_utils.get_parameters_by_path(names["path"], recursive=False)
+                host, port, database = (
+                    parameters.get(names[key]) or ssm_utils.get_parameter(names[key])
+                    for key in ("host", "port", "database")
+                )
+                port = int(port)
+                password = password_future.result()
+            user = db_config.get('user', 'edw_datamart_etl')
+            
+            # Connect to Redshift
+            conn = redshift_utils.get_redshift_connection(host, port, database, user, password)
         
         try:
-            # Get batch ID
-            batch_id = get_batch_id(conn, context.batch_subject_area_id)
-            context.batch_id = batch_id
-            
-            # Insert batch audit detail record
-            insert_batch_audit_detail(
+            # Get batch ID and insert batch audit detail record
+            batch_id = start_batch_detail(
                 conn,
-                batch_id,
+                context.batch_subject_area_id,
                 context.parameter_workflow_name,
                 context.batch_src_tbl_name,
                 context.batch_tgt_tbl_name
             )
+            context.batch_id = batch_id
             
             logger.info("Main job tasks completed successfully")
             
@@ -119,8 +148,9 @@ def run_main_job(config: Dict[str, Any]) -> Dict[str, Any]:
                 "batch_id": batch_id
             }
         finally:
-            # Close the connection
-            conn.close()
+            # Return the connection to the pool unless the caller owns it
+            if owns_conn:
+                redshift_utils.putconn(conn)
     except Exception as e:
-        logger.error(f"Main job tasks failed: {str(e)}")
+        logger.error("Main job tasks failed: %s", e)
         raise
\ No newline at end of file
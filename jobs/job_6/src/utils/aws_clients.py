@@ -0,0 +1,114 @@
+"""
+Shared boto3 session and client cache for AWS Glue Python Shell jobs.
+"""
+import boto3
+import logging
+import os
+import threading
+from typing import Dict, Any, Optional, Tuple
+from botocore.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Shared client config: a larger urllib3 connection pool than the default 10 (override
+# with AWS_MAX_POOL_CONNECTIONS), TCP keepalive, bounded timeouts, and adaptive retries
+# with backoff for throttled requests
+CLIENT_CONFIG = Config(
+    max_pool_connections=int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', '64')),
+    retries={'mode': 'adaptive', 'total_max_attempts': 10},
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=60
+)
+
+# One session for every client, so credentials are resolved and refreshed once
+_SESSION: Optional[boto3.session.Session] = None
+
+# Region used when callers pass region_name=None, resolved once per session
+_DEFAULT_REGION: Optional[str] = None
+
+# Clients reused across calls, keyed by (service name, region name)
+_CLIENTS: Dict[Tuple[str, Optional[str]], Any] = {}
+_LOCK = threading.Lock()
+
+def get_session() -> boto3.session.Session:
+    """
+    Get the shared boto3 session, creating it on first use.
+    
+    Returns:
+        boto3 session
+    """
+    global _SESSION, _DEFAULT_REGION
+    if _SESSION is None:
+        with _LOCK:
+            if _SESSION is None:
+                session = boto3.session.Session()
+                _DEFAULT_REGION = session.region_name or os.environ.get('AWS_REGION')
+                _SESSION = session
+    return _SESSION
+
+def set_session(session: boto3.session.Session) -> None:
+    """
+    Replace the shared boto3 session, e.g. with a pre-configured one in tests.
+    
+    Clients created from the previous session are dropped.
+    
+    Args:
+        session: boto3 session
+    """
+    global _SESSION, _DEFAULT_REGION
+    with _LOCK:
+        _SESSION = session
+        _DEFAULT_REGION = session.region_name or os.environ.get('AWS_REGION')
+        _CLIENTS.clear()
+
+def get_default_region() -> Optional[str]:
+    """
+    Get the region clients use when no region is given, resolved once per session.
+    
+    Returns:
+        AWS region name, or None if none is configured
+    """
+    get_session()
+    return _DEFAULT_REGION
+
+def get_client(service_name: str, region_name: Optional[str] = None) -> Any:
+    """
+    Get a client for an AWS service from the shared session.
+    
+    The client is created on first use for each service and region and reused afterwards.
+    Without region_name the session's default region is used, so the default and an
+    explicit identical region share one client.
+    
+    Args:
+        service_name: AWS service name (e.g. 's3', 'ssm')
+        region_name: AWS region name (optional)
+    
+    Returns:
+        boto3 client
+    """
+    if region_name is None:
+        region_name = get_default_region()
+    
+    cache_key = (service_name, region_name)
+    client = _CLIENTS.get(cache_key)
+    if client is None:
+        session = get_session()
+        with _LOCK:
+            client = _CLIENTS.get(cache_key)
+            if client is None:
+                client = session.client(service_name, region_name=region_name, config=CLIENT_CONFIG)
+                _CLIENTS[cache_key] = client
+    return client
+
+def reset_client_cache(service_name: Optional[str] = None) -> None:
+    """
+    Drop cached clients, e.g. in a forked process or between tests.
+    
+    Args:
+        service_name: Only drop clients for this service (optional)
+    """
+    with _LOCK:
+        for cache_key in list(_CLIENTS):
+            if service_name is None or cache_key[0] == service_name:
+                del _CLIENTS[cache_key]
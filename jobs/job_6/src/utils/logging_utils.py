@@ -4,14 +4,19 @@ Logging utility functions for AWS Glue Python Shell jobs.
 This module provides enhanced logging functionality specifically designed for AWS Glue jobs,
 ensuring logs are properly captured in CloudWatch Logs while following best practices.
 """
+import json
 import logging
 import sys
-import traceback
 import threading
 from typing import Optional, Dict, Any, Union, List
 
 # Removed thread-local storage for job context
 
+# Suppress AWS SDK verbose logging once, at import
+_NOISY_LOGGERS = ('boto3', 'botocore', 's3transfer', 'urllib3', 'matplotlib')
+for _logger_name in _NOISY_LOGGERS:
+    logging.getLogger(_logger_name).setLevel(logging.WARNING)
+
 def setup_logging(
     log_level: Union[int, str] = logging.INFO,
     log_format: Optional[str] = None,
@@ -20,6 +25,8 @@ def setup_logging(
     """
     Set up logging for the AWS Glue job with CloudWatch compatibility.
     
+    Only the first call configures the root logger; later calls return it unchanged.
+    
     Args:
         log_level: Logging level (default: INFO)
         log_format: Log format string (optional)
@@ -28,6 +35,10 @@ def setup_logging(
     Returns:
         Logger instance
     """
+    root = logging.getLogger()
+    if getattr(root, "_glue_logging_initialized", False):
+        return root
+    
     if log_format is None:
         # CloudWatch already adds timestamps, so we don't need to include them
         # A simpler format focused on level and message is better for CloudWatch
@@ -40,11 +51,9 @@ def setup_logging(
     if isinstance(log_level, str):
         log_level = getattr(logging, log_level.upper(), logging.INFO)
     
-    # Reset the root logger completely
-    root = logging.getLogger()
-    if root.handlers:
-        for handler in root.handlers:
-            root.removeHandler(handler)
+    # Reset the root logger completely (iterate over a copy, since removal mutates the list)
+    for existing_handler in list(root.handlers):
+        root.removeHandler(existing_handler)
     
     # Standard approach: Use StreamHandler with sys.stdout
     # AWS Glue automatically captures stdout and sends it to CloudWatch Logs
@@ -61,9 +70,7 @@ def setup_logging(
     root.setLevel(log_level)
     root.addHandler(handler)
     
-    # Suppress AWS SDK verbose logging
-    for logger_name in ['boto3', 'botocore', 's3transfer', 'urllib3', 'matplotlib']:
-        logging.getLogger(logger_name).setLevel(logging.WARNING)
+    root._glue_logging_initialized = True
     
     # Log initialization
     root.info("Logging initialized for AWS Glue job")
@@ -91,6 +98,18 @@ def get_logger(name: str, log_level: Optional[Union[int, str]] = None) -> loggin
     
     return logger
 
+def _log_structured(logger: logging.Logger, event: str, **fields: Any) -> None:
+    """
+    Log a single JSON record for a job or step event.
+    
+    Args:
+        logger: Logger instance
+        event: Event name
+        **fields: Additional fields to include in the record
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("%s", json.dumps({"event": event, **fields}, default=str))
+
 def log_job_start(logger: logging.Logger, job_name: str, job_args: Dict[str, Any]) -> None:
     """
     Log job start with parameters.
@@ -100,8 +119,7 @@ def log_job_start(logger: logging.Logger, job_name: str, job_args: Dict[str, Any
         job_name: Name of the job
         job_args: Job arguments
     """
-    logger.info(f"Starting job: {job_name}")
-    logger.info(f"Job parameters: {job_args}")
+    _log_structured(logger, "job_start", job=job_name, args=job_args)
 
 def log_job_end(logger: logging.Logger, job_name: str, success: bool = True) -> None:
     """
@@ -112,8 +130,8 @@ def log_job_end(logger: logging.Logger, job_name: str, success: bool = True) ->
         job_name: Name of the job
         success: Whether the job was successful
     """
-    status = "successfully" if success else "with errors"
-    logger.info(f"Job {job_name} completed {status}")
+    status = "success" if success else "failed"
+    _log_structured(logger, "job_end", job=job_name, status=status)
 
 def log_step_start(logger: logging.Logger, step_name: str) -> None:
     """
@@ -123,7 +141,7 @@ def log_step_start(logger: logging.Logger, step_name: str) -> None:
         logger: Logger instance
         step_name: Name of the step
     """
-    logger.info(f"Starting step: {step_name}")
+    _log_structured(logger, "step_start", step=step_name)
 
 def log_step_end(logger: logging.Logger, step_name: str, success: bool = True) -> None:
     """
@@ -134,8 +152,8 @@ def log_step_end(logger: logging.Logger, step_name: str, success: bool = True) -
         step_name: Name of the step
         success: Whether the step was successful
     """
-    status = "successfully" if success else "with errors"
-    logger.info(f"Step {step_name} completed {status}")
+    status = "success" if success else "failed"
+    _log_structured(logger, "step_end", step=step_name, status=status)
 
 def log_exception(logger: logging.Logger, exception: Exception, include_traceback: bool = True) -> None:
     """
@@ -147,10 +165,10 @@ def log_exception(logger: logging.Logger, exception: Exception, include_tracebac
         include_traceback: Whether to include the traceback
     """
     if include_traceback:
-        tb_lines = traceback.format_exception(type(exception), exception, exception.__traceback__)
-        logger.error(f"Exception: {str(exception)}\nTraceback:\n{''.join(tb_lines)}")
+        # Let the handler format the traceback only if the record is actually emitted
+        logger.error("Exception: %s", exception, exc_info=exception)
     else:
-        logger.error(f"Exception: {str(exception)}")
+        logger.error("Exception: %s", exception)
 
 def log_dict(logger: logging.Logger, title: str, data: Dict[str, Any], level: int = logging.INFO) -> None:
     """
@@ -9,6 +9,7 @@ It handles parameter parsing, validation, logging setup, and exception handling.
 import sys
 import os
 import uuid
+import concurrent.futures
 from typing import Dict, Any
 
 # Import utility modules
@@ -16,6 +17,7 @@ from src.utils import logging_utils
 from src.utils import argument_utils
 
 # Import job modules
+from src.joblets.jl_Frmwrk_EDW_LOAD_CONTEXT import main_joblet as load_context_joblet
 from src.jobs.Job_EDW_ST_CNSMPTN_CMN_DIM_US_STG_TO_SUBS_DTL.pre_job import run_pre_job
 from src.jobs.Job_EDW_ST_CNSMPTN_CMN_DIM_US_STG_TO_SUBS_DTL.main_job import run_main_job
 from src.jobs.Job_EDW_ST_CNSMPTN_CMN_DIM_US_STG_TO_SUBS_DTL.post_job import run_post_job
@@ -26,23 +28,41 @@ from src.context import context
 # Import config
 from src.config.config_loader import load_config
 
-def main():
-    """
-    Main entry point for the Glue job.
+def resolve_config(logger, config_future: concurrent.futures.Future) -> Dict[str, Any]:
     """
-    # Set up logging
-    logger = logging_utils.setup_logging()
+    Wait for the background configuration load, falling back to an empty configuration.
     
-    # Load environment-specific configuration from SSM
+    Args:
+        logger: Logger instance
+        config_future: Future returned by submitting load_config
+        
+    Returns:
+        Environment-specific configuration, or an empty dictionary if it failed to load
+    """
     try:
-        config = load_config()
+        config = config_future.result()
         environment_name = config.get('environment', {}).get('name', 'unknown')
         logger.info(f"Loaded configuration for environment: {environment_name}")
+        return config
         
     except Exception as e:
         logger.error(f"Failed to load configuration: {str(e)}")
         logger.info("Continuing with default configuration")
-        config = {}
+        return {}
+
+def main():
+    """
+    Main entry point for the Glue job.
+    """
+    # Set up logging
+    logger = logging_utils.setup_logging()
+    
+    # Load environment-specific configuration from SSM in the background, so the SSM
+    # round trips overlap argument parsing and the context file load
+    config_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    config_future = config_executor.submit(load_config)
+    config_executor.shutdown(wait=False)
+    config = {}
     
     params = {}  # Initialize params outside try block for exception handler
     success = False
@@ -66,9 +86,11 @@ def main():
         # Log job start with parameters
         logging_utils.log_job_start(logger, context.parameter_workflow_name, params)
         
-        # Run pre-job tasks
+        # Run pre-job tasks, loading the context variables before waiting on the configuration
         logging_utils.log_step_start(logger, "pre_job_tasks")
-        pre_job_results = run_pre_job(config)
+        load_context_joblet.run_joblet()
+        config = resolve_config(logger, config_future)
+        pre_job_results = run_pre_job(config, load_context=False)
         logging_utils.log_step_end(logger, "pre_job_tasks")
         
         # Run main job processing
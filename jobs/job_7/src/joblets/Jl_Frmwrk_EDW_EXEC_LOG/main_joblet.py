@@ -3,16 +3,69 @@ Jl_Frmwrk_EDW_EXEC_LOG joblet implementation.
 
 This module provides functionality for execution logging and statistics.
 """
+import atexit
 import os
 import logging
-import datetime
-from typing import Dict, Any, Optional
+import threading
+import time
+from typing import Dict, Any, Optional, TextIO
 
 from src.context import context
 from src.utils import logging_utils
 
 logger = logging.getLogger(__name__)
 
+# Log files kept open in append mode for the life of the process, keyed by path
+_LOG_FILES: Dict[str, TextIO] = {}
+_LOG_FILES_LOCK = threading.Lock()
+
+# Pipe-delimited line layouts, filled with one format_map call over the defaults
+# merged with the caller's fields
+_STATS_LINE = "{timestamp}|{job_name}|{duration}|{status}|{records_processed}|{father_pid}|{pid}\n"
+_STATS_DEFAULTS = {
+    'job_name': 'unknown',
+    'duration': 0,
+    'status': 'unknown',
+    'records_processed': 0,
+    'father_pid': '0',
+    'pid': '0'
+}
+_EVENT_LINE = "{timestamp}|{job_name}|{level}|{message}|{father_pid}|{pid}\n"
+_EVENT_DEFAULTS = {
+    'job_name': 'unknown',
+    'level': 'INFO',
+    'message': '',
+    'father_pid': '0',
+    'pid': '0'
+}
+
+def _append_line(log_file_path: str, line: str) -> None:
+    """
+    Append a line to a log file through a line-buffered handle opened on first use.
+    
+    The directory is created when the file is first opened rather than on every call.
+    Each line reaches the file as soon as it is written, so nothing is lost if the
+    job is killed before close_log_files() runs.
+    """
+    with _LOG_FILES_LOCK:
+        f = _LOG_FILES.get(log_file_path)
+        if f is None:
+            os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
+            f = open(log_file_path, 'a', buffering=1)
+            _LOG_FILES[log_file_path] = f
+        f.write(line)
+
+def close_log_files() -> None:
+    """
+    Close every log file opened by this joblet.
+    """
+    with _LOG_FILES_LOCK:
+        for f in _LOG_FILES.values():
+            f.close()
+        _LOG_FILES.clear()
+
+atexit.register(close_log_files)
+
 def log_statistics(log_file_path: str, statistics: Dict[str, Any]) -> None:
     """
     Log execution statistics to a file.
@@ -25,18 +78,12 @@ def log_statistics(log_file_path: str, statistics: Dict[str, Any]) -> None:
         Exception: If the statistics cannot be logged
     """
     try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
-        
         # Format the statistics as a pipe-delimited string
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        stats_line = f"{timestamp}|{statistics.get('job_name', 'unknown')}|{statistics.get('duration', 0)}|"
-        stats_line += f"{statistics.get('status', 'unknown')}|{statistics.get('records_processed', 0)}|"
-        stats_line += f"{statistics.get('father_pid', '0')}|{statistics.get('pid', '0')}\n"
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        stats_line = _STATS_LINE.format_map({**_STATS_DEFAULTS, **statistics, 'timestamp': timestamp})
         
         # Write to the log file
-        with open(log_file_path, 'a') as f:
-            f.write(stats_line)
+        _append_line(log_file_path, stats_line)
         
         logger.info(f"Logged statistics to {log_file_path}")
     except Exception as e:
@@ -55,17 +102,12 @@ def log_event(log_file_path: str, event: Dict[str, Any]) -> None:
         Exception: If the event cannot be logged
     """
     try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
-        
         # Format the event as a pipe-delimited string
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        event_line = f"{timestamp}|{event.get('job_name', 'unknown')}|{event.get('level', 'INFO')}|"
-        event_line += f"{event.get('message', '')}|{event.get('father_pid', '0')}|{event.get('pid', '0')}\n"
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        event_line = _EVENT_LINE.format_map({**_EVENT_DEFAULTS, **event, 'timestamp': timestamp})
         
         # Write to the log file
-        with open(log_file_path, 'a') as f:
-            f.write(event_line)
+        _append_line(log_file_path, event_line)
         
         logger.info(f"Logged event to {log_file_path}")
     except Exception as e:
@@ -3,6 +3,7 @@ Pre-job tasks for the Job_EDW_ST_CNSMPTN_CMN_DIM_US_STG_TO_SUBS_DTL job.
 
 This module contains functions for the pre-job phase of the Job_EDW_ST_CNSMPTN_CMN_DIM_US_STG_TO_SUBS_DTL job.
 """
+import concurrent.futures
 import logging
 from typing import Dict, Any, Optional, Tuple
 
@@ -36,15 +37,18 @@ def establish_database_connections(config: Dict[str, Any]) -> Tuple[Any, Any]:
         port = int(ssm_utils.get_parameter("/edo/" + context.batch_env + "/redshift/port"))
         database = ssm_utils.get_parameter("/edo/" + context.batch_env + "/redshift/database")
         
-        # Connect to Redshift datamart
-        datamart_user = datamart_config.get('user', 'edw_datamart_etl')
-        datamart_password = ssm_utils.get_parameter(datamart_config.get('parameter_store_path', '/edo/dev/redshift/datamart/edw_datamart_stg'), True)
-        datamart_conn = redshift_utils.get_redshift_connection(host, port, database, datamart_user, datamart_password)
+        def connect(db_config: Dict[str, Any], default_parameter_store_path: str) -> Any:
+            user = db_config.get('user', 'edw_datamart_etl')
+            password = ssm_utils.get_parameter(db_config.get('parameter_store_path', default_parameter_store_path), True)
+            return redshift_utils.get_redshift_connection(host, port, database, user, password)
         
-        # Connect to Redshift ODS
-        ods_user = ods_config.get('user', 'edw_datamart_etl')
-        ods_password = ssm_utils.get_parameter(ods_config.get('parameter_store_path', '/edo/dev/redshift/ods/edw_ods'), True)
-        ods_conn = redshift_utils.get_redshift_connection(host, port, database, ods_user, ods_password)
+        # Connect to the Redshift datamart and ODS concurrently; each needs its own
+        # password lookup and handshake, and neither depends on the other
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            datamart_future = executor.submit(connect, datamart_config, '/edo/dev/redshift/datamart/edw_datamart_stg')
+            ods_future = executor.submit(connect, ods_config, '/edo/dev/redshift/ods/edw_ods')
+            datamart_conn = datamart_future.result()
+            ods_conn = ods_future.result()
         
         logger.info("Successfully established database connections")
         
@@ -53,12 +57,14 @@ def establish_database_connections(config: Dict[str, Any]) -> Tuple[Any, Any]:
         logger.error(f"Failed to establish database connections: {str(e)}")
         raise
 
-def run_pre_job(config: Dict[str, Any]) -> Dict[str, Any]:
+def run_pre_job(config: Dict[str, Any], load_context: bool = True) -> Dict[str, Any]:
     """
     Run pre-job tasks for the Job_EDW_ST_CNSMPTN_CMN_DIM_US_STG_TO_SUBS_DTL job.
     
     Args:
         config: Configuration dictionary
+        load_context: Whether to load the context variables first; False when the
+            caller has already run the load context joblet (default: True)
         
     Returns:
         Dictionary with database connections
@@ -68,7 +74,8 @@ def run_pre_job(config: Dict[str, Any]) -> Dict[str, Any]:
     """
     try:
         # Load context variables
-        load_context_joblet.run_joblet()
+        if load_context:
+            load_context_joblet.run_joblet()
         
         # Set source and target table names
         context.batch_src_tbl_name = context.stg_src_table
@@ -77,8 +84,8 @@ def run_pre_job(config: Dict[str, Any]) -> Dict[str, Any]:
         # Establish database connections
         datamart_conn, ods_conn = establish_database_connections(config)
         
-        # Run batch detail start job
-        batch_detail_start.run_main_job(config)
+        # Run batch detail start job on the datamart connection opened above
+        batch_detail_start.run_main_job(config, datamart_conn)
         
         logger.info("Pre-job tasks completed successfully")
         
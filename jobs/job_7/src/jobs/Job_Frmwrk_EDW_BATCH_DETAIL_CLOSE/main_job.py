@@ -26,13 +26,17 @@ def get_batch_detail_id(conn, job_name: str) -> int:
         Exception: If the batch detail ID cannot be retrieved
     """
     try:
-        query = f"""
-        select max(batch_detail_id) from edw_ods.batch_audit_detail 
-        where JOB_NM = '{job_name}' 
+        # Read only the newest matching row instead of aggregating over every match
+        query = """
+        select batch_detail_id from edw_ods.batch_audit_detail 
+        where JOB_NM = %(job_name)s 
         and PROCESS_STATUS_CD = 'In Progress'
+        order by batch_detail_id desc
+        limit 1
         """
+        params = {'job_name': job_name}
         
-        result = redshift_utils.fetch_one(conn, query)
+        result = redshift_utils.fetch_one(conn, query, params)
         
         if result and result[0]:
             batch_detail_id = result[0]
@@ -66,41 +70,47 @@ def update_batch_audit_detail(conn, batch_detail_id: int, src_rec_qty: int, ins_
         Exception: If the record cannot be updated
     """
     try:
-        # Handle optional parameters
-        file_nm_value = f"'{file_nm}'" if file_nm else "'N/A'"
-        file_rcvd_ts_value = f"'{file_rcvd_ts}'" if file_rcvd_ts else "null"
-        file_size_value = str(file_size) if file_size is not None else "null"
-        
-        query = f"""
-        begin;
+        # One bound UPDATE; optional values that are missing are sent as NULL
+        query = """
         UPDATE edw_ods.batch_audit_detail 
         SET 
         PROCESS_STATUS_CD = 'Complete', 
         batch_detail_end_ts = current_timestamp,
-        FILE_NM = {file_nm_value},
-        FILE_RCVD_TS = {file_rcvd_ts_value},
-        FILE_SIZE_IN_BYTES_QTY = {file_size_value},
-        SRC_REC_QTY = {src_rec_qty},
-        INS_REC_QTY = {ins_rec_qty},
-        UPD_REC_QTY = {upd_rec_qty},
-        ERR_REC_QTY = {err_rec_qty}
+        FILE_NM = %(file_nm)s,
+        FILE_RCVD_TS = %(file_rcvd_ts)s,
+        FILE_SIZE_IN_BYTES_QTY = %(file_size)s,
+        SRC_REC_QTY = %(src_rec_qty)s,
+        INS_REC_QTY = %(ins_rec_qty)s,
+        UPD_REC_QTY = %(upd_rec_qty)s,
+        ERR_REC_QTY = %(err_rec_qty)s
         WHERE 
-        batch_detail_id = {batch_detail_id};
-        end;
+        batch_detail_id = %(batch_detail_id)s;
         """
+        params = {
+            'file_nm': file_nm or 'N/A',
+            'file_rcvd_ts': file_rcvd_ts or None,
+            'file_size': file_size,
+            'src_rec_qty': src_rec_qty,
+            'ins_rec_qty': ins_rec_qty,
+            'upd_rec_qty': upd_rec_qty,
+            'err_rec_qty': err_rec_qty,
+            'batch_detail_id': batch_detail_id
+        }
         
-        redshift_utils.execute_query(conn, query)
+        redshift_utils.execute_query(conn, query, params)
         logger.info(f"Updated batch audit detail record for batch detail ID {batch_detail_id}")
     except Exception as e:
         logger.error(f"Failed to update batch audit detail record: {str(e)}")
         raise
 
-def run_main_job(config: Dict[str, Any]) -> Dict[str, Any]:
+def run_main_job(config: Dict[str, Any], conn=None) -> Dict[str, Any]:
     """
     Run main job tasks for the Job_Frmwrk_EDW_BATCH_DETAIL_CLOSE job.
     
     Args:
         config: Configuration dictionary
+        conn: Open Redshift datamart connection to reuse (optional); when omitted a
+            connection is taken from the pool and returned afterwards
         
     Returns:
         Dictionary of job results
@@ -109,18 +119,20 @@ def run_main_job(config: Dict[str, Any]) -> Dict[str, Any]:
         Exception: If main job tasks fail
     """
     try:
-        # Get database configuration
-        db_config = config.get('database', {}).get('redshift_datamart', {})
-        
-        # Get database connection parameters from SSM Parameter Store
-        host = ssm_utils.get_parameter("/edo/" + context.batch_env + "/redshift/host")
-        port = int(ssm_utils.get_parameter("/edo/" + context.batch_env + "/redshift/port"))
-        database = ssm_utils.get_parameter("/edo/" + context.batch_env + "/redshift/database")
-        user = db_config.get('user', 'edw_datamart_etl')
-        password = ssm_utils.get_parameter(db_config.get('parameter_store_path', '/edo/dev/redshift/datamart/edw_datamart_stg'), True)
-        
-        # Connect to Redshift
-        conn = redshift_utils.get_redshift_connection(host, port, database, user, password)
+        owns_conn = conn is None
+        if owns_conn:
+            # Get database configuration
+            db_config = config.get('database', {}).get('redshift_datamart', {})
+            
+            # Get database connection parameters from SSM Parameter Store
+            host = ssm_utils.get_parameter("/edo/" + context.batch_env + "/redshift/host")
+            port = int(ssm_utils.get_parameter("/edo/" + context.batch_env + "/redshift/port"))
+            database = ssm_utils.get_parameter("/edo/" + context.batch_env + "/redshift/database")
+            user = db_config.get('user', 'edw_datamart_etl')
+            password = ssm_utils.get_parameter(db_config.get('parameter_store_path', '/edo/dev/redshift/datamart/edw_datamart_stg'), True)
+            
+            # Connect to Redshift
+            conn = redshift_utils.get_redshift_connection(host, port, database, user, password)
         
         try:
             # Get batch detail ID
@@ -146,8 +158,9 @@ def run_main_job(config: Dict[str, Any]) -> Dict[str, Any]:
                 "batch_detail_id": batch_detail_id
             }
         finally:
-            # Close the connection
-            conn.close()
+            # Return the connection to the pool unless the caller owns it
+            if owns_conn:
+                redshift_utils.putconn(conn)
     except Exception as e:
         logger.error(f"Main job tasks failed: {str(e)}")
         raise
\ No newline at end of file
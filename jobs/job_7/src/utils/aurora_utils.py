@@ -1,21 +1,56 @@
 """
 Aurora PostgreSQL database utility functions for AWS Glue Python Shell jobs.
 """
+import atexit
 import boto3
+import contextlib
+import io
+import itertools
 import logging
-import json
+import re
+import threading
 from typing import Dict, Any, List, Optional, Union, Tuple
 import pandas as pd
 
 # Import database drivers
 try:
     import psycopg2
+    import psycopg2.extras
+    import psycopg2.pool
+    import psycopg2.sql
     POSTGRES_AVAILABLE = True
 except ImportError:
     POSTGRES_AVAILABLE = False
 
+# Pool factory bound once at import, so only pool creation has to deal with a missing driver
+if POSTGRES_AVAILABLE:
+    _new_pool = psycopg2.pool.ThreadedConnectionPool
+else:
+    def _new_pool(*args, **kwargs):
+        raise ImportError("psycopg2 is not installed. Install it with 'pip install psycopg2-binary'")
+
+# orjson decodes secrets faster when it is installed; stdlib json is the fallback
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 logger = logging.getLogger(__name__)
 
+# Connection pools kept in module scope so repeat connections skip the TCP/TLS/auth
+# handshake, keyed by (host, port, database, user, password, connection kwargs)
+_POOLS: Dict[Tuple[Any, ...], Any] = {}
+_POOLS_LOCK = threading.Lock()
+
+# Pool each checked-out connection belongs to, keyed by id(conn)
+_CONN_POOLS: Dict[int, Any] = {}
+
+# Suffixes that keep server-side cursor names unique within a session
+_CURSOR_IDS = itertools.count()
+
+# Matches the single ``VALUES %s`` placeholder that execute_values expands
+_VALUES_PLACEHOLDER_RE = re.compile(r'\bVALUES\s+%s', re.IGNORECASE)
+
 def get_aurora_postgres_connection(
     host: str,
     port: int,
@@ -27,6 +62,10 @@ def get_aurora_postgres_connection(
     """
     Get a connection to an Aurora PostgreSQL database.
     
+    Connections are taken from a module-level pool that is created on first use;
+    hand them back with putconn() instead of closing them. Calls with a different
+    password or connection kwargs get a pool of their own.
+    
     Args:
         host: Aurora PostgreSQL host
         port: Aurora PostgreSQL port
@@ -42,24 +81,67 @@ def get_aurora_postgres_connection(
         ImportError: If psycopg2 is not installed
         Exception: If the connection cannot be established
     """
-    if not POSTGRES_AVAILABLE:
-        raise ImportError("psycopg2 is not installed. Install it with 'pip install psycopg2-binary'")
-    
     try:
-        conn = psycopg2.connect(
-            host=host,
-            port=port,
-            dbname=database,
-            user=user,
-            password=password,
-            **kwargs
-        )
+        pool_key = (host, int(port), database, user, password, tuple(sorted(kwargs.items())))
+        pool = _POOLS.get(pool_key)
+        if pool is None:
+            # Created under the lock so concurrent first calls for the same key share
+            # one pool instead of each opening a pool and leaking all but the last
+            with _POOLS_LOCK:
+                pool = _POOLS.get(pool_key)
+                if pool is None:
+                    pool = _new_pool(
+                        minconn=1,
+                        maxconn=10,
+                        host=host,
+                        port=port,
+                        dbname=database,
+                        user=user,
+                        password=password,
+                        **kwargs
+                    )
+                    _POOLS[pool_key] = pool
+        
+        conn = pool.getconn()
+        _CONN_POOLS[id(conn)] = pool
         logger.info(f"Successfully connected to Aurora PostgreSQL database: {database} on {host}")
         return conn
     except Exception as e:
         logger.error(f"Error connecting to Aurora PostgreSQL database: {str(e)}")
         raise
 
+def putconn(conn: psycopg2.extensions.connection) -> None:
+    """
+    Return a connection to the pool it was taken from.
+    
+    Connections that did not come from a pool are closed instead.
+    
+    Args:
+        conn: psycopg2 connection
+    """
+    pool = _CONN_POOLS.pop(id(conn), None)
+    if pool is None:
+        conn.close()
+        return
+    
+    pool.putconn(conn, close=bool(conn.closed))
+    logger.info("Returned Aurora PostgreSQL connection to pool")
+
+def close_all_connections() -> None:
+    """
+    Close every pooled Aurora PostgreSQL connection.
+    """
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    
+    for pool in pools:
+        if not pool.closed:
+            pool.closeall()
+    _CONN_POOLS.clear()
+
+atexit.register(close_all_connections)
+
 def get_aurora_postgres_connection_from_secret(
     secret_name: str,
     region_name: Optional[str] = None
@@ -89,7 +171,7 @@ def get_aurora_postgres_connection_from_secret(
         secret_value = get_parameter(secret_name, True, region_name)
         
         # Parse the secret
-        secret = json.loads(secret_value)
+        secret = _json.loads(secret_value)
         
         # Get the connection
         return get_aurora_postgres_connection(
@@ -142,10 +224,145 @@ def execute_query(
             conn.rollback()
         raise
 
+def prepare(
+    conn: psycopg2.extensions.connection,
+    name: str,
+    query: str
+) -> None:
+    """
+    Create a prepared statement on the connection's session.
+    
+    The statement is parsed and planned once; run it with execute_prepared(). Prepared
+    statements last for the session, so a pooled connection keeps them after putconn().
+    
+    Args:
+        conn: psycopg2 connection
+        name: Statement name
+        query: SQL statement using $1, $2, ... placeholders
+        
+    Raises:
+        Exception: If the statement cannot be prepared
+    """
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            psycopg2.sql.SQL("PREPARE {} AS {}").format(psycopg2.sql.Identifier(name), psycopg2.sql.SQL(query))
+        )
+        cursor.close()
+        
+        logger.info(f"Successfully prepared PostgreSQL statement {name}")
+    except Exception as e:
+        logger.error(f"Error preparing PostgreSQL statement {name}: {str(e)}")
+        raise
+
+def execute_prepared(
+    conn: psycopg2.extensions.connection,
+    name: str,
+    params: Optional[Tuple] = None,
+    commit: bool = True
+) -> int:
+    """
+    Execute a statement created with prepare(), skipping the parse and plan steps.
+    
+    Args:
+        conn: psycopg2 connection
+        name: Statement name
+        params: Values for the statement's $1, $2, ... placeholders (optional)
+        commit: Whether to commit the transaction (default: True)
+        
+    Returns:
+        Number of rows affected
+        
+    Raises:
+        Exception: If the statement cannot be executed
+    """
+    params = tuple(params or ())
+    query = psycopg2.sql.SQL("EXECUTE {}").format(psycopg2.sql.Identifier(name))
+    if params:
+        query += psycopg2.sql.SQL("({})").format(
+            psycopg2.sql.SQL(", ").join([psycopg2.sql.Placeholder()] * len(params))
+        )
+    
+    return execute_query(conn, query, params or None, commit)
+
+def execute_many(
+    conn: psycopg2.extensions.connection,
+    query: str,
+    rows: List[Union[Tuple, List]],
+    page_size: int = 1000,
+    commit: bool = True
+) -> int:
+    """
+    Execute a statement for many rows on an Aurora PostgreSQL database.
+    
+    Rows are sent a page at a time rather than one round trip per row. A query with a
+    single ``VALUES %s`` placeholder, e.g. ``INSERT INTO tbl (a, b) VALUES %s``, is
+    expanded into one multi-row VALUES list per page; any other query is sent as a
+    batch of statements per page.
+    
+    Args:
+        conn: psycopg2 connection
+        query: SQL query, either with a single ``VALUES %s`` placeholder or with
+            per-row placeholders
+        rows: Sequence of row tuples
+        page_size: Number of rows sent per round trip (default: 1000)
+        commit: Whether to commit the transaction (default: True)
+        
+    Returns:
+        Number of rows affected
+        
+    Raises:
+        Exception: If the query cannot be executed
+    """
+    try:
+        with conn.cursor() as cursor:
+            if _VALUES_PLACEHOLDER_RE.search(query):
+                psycopg2.extras.execute_values(cursor, query, rows, page_size=page_size)
+            else:
+                psycopg2.extras.execute_batch(cursor, query, rows, page_size=page_size)
+            
+            if commit:
+                conn.commit()
+        
+        logger.info(f"Successfully executed PostgreSQL batch query, {len(rows)} rows affected")
+        return len(rows)
+    except Exception as e:
+        logger.error(f"Error executing PostgreSQL batch query: {str(e)}")
+        if commit:
+            conn.rollback()
+        raise
+
+@contextlib.contextmanager
+def _autocommit_reads(conn: psycopg2.extensions.connection, enabled: bool):
+    """
+    Run the enclosed reads in autocommit mode, without a BEGIN or a transaction that
+    stays open afterwards.
+    
+    The connection is left alone when it is already in autocommit mode or has a
+    transaction open, so reads made after an uncommitted write still see that write.
+    
+    Args:
+        conn: psycopg2 connection
+        enabled: Whether to switch to autocommit
+        
+    Yields:
+        None
+    """
+    if not enabled or conn.autocommit or conn.status != psycopg2.extensions.STATUS_READY:
+        yield
+        return
+    
+    conn.autocommit = True
+    try:
+        yield
+    finally:
+        conn.autocommit = False
+
 def fetch_all(
     conn: psycopg2.extensions.connection,
     query: str,
-    params: Optional[Union[Tuple, Dict[str, Any]]] = None
+    params: Optional[Union[Tuple, Dict[str, Any]]] = None,
+    autocommit: bool = True
 ) -> List[Tuple]:
     """
     Fetch all rows from a query on an Aurora PostgreSQL database.
@@ -154,6 +371,7 @@ def fetch_all(
         conn: psycopg2 connection
         query: SQL query
         params: Query parameters (optional)
+        autocommit: Run the read outside a transaction when none is open (default: True)
         
     Returns:
         List of rows
@@ -162,11 +380,12 @@ def fetch_all(
         Exception: If the query cannot be executed
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        
-        rows = cursor.fetchall()
-        cursor.close()
+        with _autocommit_reads(conn, autocommit):
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            
+            rows = cursor.fetchall()
+            cursor.close()
         
         logger.info(f"Successfully fetched {len(rows)} rows from PostgreSQL")
         return rows
@@ -177,7 +396,8 @@ def fetch_all(
 def fetch_one(
     conn: psycopg2.extensions.connection,
     query: str,
-    params: Optional[Union[Tuple, Dict[str, Any]]] = None
+    params: Optional[Union[Tuple, Dict[str, Any]]] = None,
+    autocommit: bool = True
 ) -> Optional[Tuple]:
     """
     Fetch one row from a query on an Aurora PostgreSQL database.
@@ -186,6 +406,7 @@ def fetch_one(
         conn: psycopg2 connection
         query: SQL query
         params: Query parameters (optional)
+        autocommit: Run the read outside a transaction when none is open (default: True)
         
     Returns:
         Row or None if no rows are returned
@@ -194,11 +415,12 @@ def fetch_one(
         Exception: If the query cannot be executed
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        
-        row = cursor.fetchone()
-        cursor.close()
+        with _autocommit_reads(conn, autocommit):
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            
+            row = cursor.fetchone()
+            cursor.close()
         
         if row:
             logger.info("Successfully fetched one row")
@@ -213,15 +435,28 @@ def fetch_one(
 def fetch_as_dataframe(
     conn: psycopg2.extensions.connection,
     query: str,
-    params: Optional[Union[Tuple, Dict[str, Any]]] = None
+    params: Optional[Union[Tuple, Dict[str, Any]]] = None,
+    batch_size: int = 50000,
+    use_copy: bool = False
 ) -> pd.DataFrame:
     """
     Fetch query results as a pandas DataFrame from Aurora PostgreSQL.
     
+    Rows are streamed through a server-side cursor in batches and appended to one buffer
+    per column, and the DataFrame is built from those columns instead of going through
+    pandas' SQL layer, so the full result set is never held as a list of row tuples.
+    
+    With use_copy, the query is instead wrapped in COPY ... TO STDOUT and the CSV stream
+    is parsed by pandas' C reader, which is much faster for large results. Column types
+    are then inferred from the CSV text rather than taken from the driver, so dates and
+    timestamps come back as strings.
+    
     Args:
         conn: psycopg2 connection
         query: SQL query
         params: Query parameters (optional)
+        batch_size: Number of rows to fetch in each batch (default: 50000)
+        use_copy: Fetch through the COPY protocol as CSV (default: False)
         
     Returns:
         pandas DataFrame
@@ -230,8 +465,35 @@ def fetch_as_dataframe(
         Exception: If the query cannot be executed
     """
     try:
-        # Use pandas to execute the query and return a DataFrame
-        df = pd.read_sql_query(query, conn, params=params)
+        if use_copy:
+            with conn.cursor() as cursor:
+                # COPY takes no bind parameters, so they are interpolated client-side
+                # exactly as cursor.execute would do
+                select_query = cursor.mogrify(query, params).rstrip().rstrip(b';')
+                csv_buffer = io.BytesIO()
+                cursor.copy_expert(
+                    b"COPY (" + select_query + b") TO STDOUT WITH (FORMAT CSV, HEADER TRUE)",
+                    csv_buffer
+                )
+            csv_buffer.seek(0)
+            df = pd.read_csv(csv_buffer)
+        else:
+            with conn.cursor(name=f"fetch_as_dataframe_{next(_CURSOR_IDS)}") as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(query, params)
+                
+                # A server-side cursor only has a description after the first fetch
+                rows = cursor.fetchmany(batch_size)
+                column_names = [desc[0] for desc in cursor.description]
+                columns = [[] for _ in column_names]
+                while rows:
+                    for buffer, values in zip(columns, zip(*rows)):
+                        buffer.extend(values)
+                    rows = cursor.fetchmany(batch_size)
+            
+            # Key the buffers by position so duplicate column names each keep their own values
+            df = pd.DataFrame(dict(enumerate(columns)))
+            df.columns = column_names
         
         logger.info(f"Successfully fetched {len(df)} rows as DataFrame from PostgreSQL")
         return df
@@ -1,14 +1,56 @@
 """
 Redshift database utility functions for AWS Glue Python Shell jobs.
 """
+import atexit
+import importlib.util
+import itertools
 import boto3
 import psycopg2
+import psycopg2.extras
+import psycopg2.pool
 import logging
-from typing import Dict, Any, List, Optional, Union, Tuple
-import pandas as pd
+import threading
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional, Union, Tuple
+from urllib.parse import quote
+
+from src.utils.ssm_utils import get_parameter
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# orjson decodes secrets faster when it is installed; stdlib json is the fallback
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
 logger = logging.getLogger(__name__)
 
+# Check if connectorx is available (imported lazily in fetch_as_dataframe)
+CONNECTORX_AVAILABLE = importlib.util.find_spec("connectorx") is not None
+
+# Connection pools kept in module scope so warm Glue containers reuse open sockets,
+# keyed by (host, port, database, user, password, connection kwargs)
+_POOLS: Dict[Tuple[Any, ...], psycopg2.pool.ThreadedConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+# Pool each checked-out connection belongs to, keyed by id(conn)
+_CONN_POOLS: Dict[int, psycopg2.pool.ThreadedConnectionPool] = {}
+
+# Server-side statement timeout (ms); generous enough for the staging loads in main_job
+STATEMENT_TIMEOUT_MS = 60 * 60 * 1000
+
+# Suffixes that keep server-side cursor names unique within a session
+_CURSOR_IDS = itertools.count()
+
+# TCP keepalive settings so broken connections are detected in about a minute
+KEEPALIVE_OPTIONS = {
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 3,
+}
+
 def get_redshift_connection(
     host: str,
     port: int,
@@ -20,13 +62,18 @@ def get_redshift_connection(
     """
     Get a connection to a Redshift database.
     
+    Connections are taken from a module-level pool that is created on first use;
+    hand them back with putconn() instead of closing them. Calls with a different
+    password or connection kwargs get a pool of their own.
+    
     Args:
         host: Redshift host
         port: Redshift port
         database: Redshift database name
         user: Redshift user
         password: Redshift password
-        **kwargs: Additional connection parameters
+        **kwargs: Additional connection parameters; these override the default
+            keepalive settings and statement timeout
         
     Returns:
         psycopg2 connection
@@ -35,20 +82,70 @@ def get_redshift_connection(
         Exception: If the connection cannot be established
     """
     try:
-        conn = psycopg2.connect(
-            host=host,
-            port=port,
-            dbname=database,
-            user=user,
-            password=password,
-            **kwargs
-        )
-        logger.info(f"Successfully connected to Redshift database: {database} on {host}")
+        for option, value in KEEPALIVE_OPTIONS.items():
+            kwargs.setdefault(option, value)
+        kwargs.setdefault('options', f"-c statement_timeout={STATEMENT_TIMEOUT_MS}")
+        
+        pool_key = (host, int(port), database, user, password, tuple(sorted(kwargs.items())))
+        pool = _POOLS.get(pool_key)
+        if pool is None:
+            # Created under the lock so concurrent first calls for the same key share
+            # one pool instead of each opening a pool and leaking all but the last
+            with _POOLS_LOCK:
+                pool = _POOLS.get(pool_key)
+                if pool is None:
+                    pool = psycopg2.pool.ThreadedConnectionPool(
+                        minconn=1,
+                        maxconn=4,
+                        host=host,
+                        port=port,
+                        dbname=database,
+                        user=user,
+                        password=password,
+                        **kwargs
+                    )
+                    _POOLS[pool_key] = pool
+        
+        conn = pool.getconn()
+        _CONN_POOLS[id(conn)] = pool
+        logger.info("Successfully connected to Redshift database: %s on %s", database, host)
         return conn
     except Exception as e:
-        logger.error(f"Error connecting to Redshift database: {str(e)}")
+        logger.error("Error connecting to Redshift database: %s", e)
         raise
 
+def putconn(conn: psycopg2.extensions.connection) -> None:
+    """
+    Return a connection to the pool it was taken from.
+    
+    Connections that did not come from a pool are closed instead.
+    
+    Args:
+        conn: psycopg2 connection
+    """
+    pool = _CONN_POOLS.pop(id(conn), None)
+    if pool is None:
+        conn.close()
+        return
+    
+    pool.putconn(conn, close=bool(conn.closed))
+    logger.info("Returned Redshift connection to pool")
+
+def close_all_connections() -> None:
+    """
+    Close every pooled Redshift connection.
+    """
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    
+    for pool in pools:
+        if not pool.closed:
+            pool.closeall()
+    _CONN_POOLS.clear()
+
+atexit.register(close_all_connections)
+
 def get_redshift_connection_from_secret(
     secret_name: str,
     region_name: Optional[str] = None
@@ -67,15 +164,11 @@ def get_redshift_connection_from_secret(
         Exception: If the connection cannot be established
     """
     try:
-        # Import here to avoid circular imports
-        from src.utils.ssm_utils import get_parameter
-        
         # Get the secret
         secret_value = get_parameter(secret_name, True, region_name)
         
         # Parse the secret
-        import json
-        secret = json.loads(secret_value)
+        secret = _json.loads(secret_value)
         
         # Get the connection
         return get_redshift_connection(
@@ -86,7 +179,7 @@ def get_redshift_connection_from_secret(
             password=secret['password']
         )
     except Exception as e:
-        logger.error(f"Error getting Redshift connection from secret: {str(e)}")
+        logger.error("Error getting Redshift connection from secret: %s", e)
         raise
 
 def execute_query(
@@ -111,23 +204,111 @@ def execute_query(
         Exception: If the query cannot be executed
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
+        with conn.cursor() as cursor:
+            cursor.execute(query, params)
+            
+            if commit:
+                conn.commit()
+                
+            row_count = cursor.rowcount
         
+        logger.info("Successfully executed query, %s rows affected", row_count)
+        return row_count
+    except Exception as e:
+        logger.error("Error executing query: %s", e)
         if commit:
-            conn.commit()
+            conn.rollback()
+        raise
+
+def execute_many(
+    conn: psycopg2.extensions.connection,
+    query: str,
+    rows: List[Union[Tuple, List]],
+    page_size: int = 500,
+    commit: bool = True
+) -> int:
+    """
+    Execute a multi-row statement on a Redshift database.
+    
+    Rows are packed into one multi-row VALUES list per page, so prefer this over
+    calling execute_query in a loop. The query must contain a single ``VALUES %s``
+    placeholder, e.g. ``INSERT INTO tbl (a, b) VALUES %s``.
+    
+    Args:
+        conn: psycopg2 connection
+        query: SQL query with a single ``VALUES %s`` placeholder
+        rows: Sequence of row tuples
+        page_size: Number of rows sent per statement (default: 500)
+        commit: Whether to commit the transaction (default: True)
+        
+    Returns:
+        Number of rows affected
+        
+    Raises:
+        Exception: If the query cannot be executed
+    """
+    try:
+        with conn.cursor() as cursor:
+            psycopg2.extras.execute_values(cursor, query, rows, page_size=page_size)
             
-        row_count = cursor.rowcount
-        cursor.close()
+            if commit:
+                conn.commit()
         
-        logger.info(f"Successfully executed query, {row_count} rows affected")
-        return row_count
+        logger.info("Successfully executed batch query, %d rows affected", len(rows))
+        return len(rows)
     except Exception as e:
-        logger.error(f"Error executing query: {str(e)}")
+        logger.error("Error executing batch query: %s", e)
         if commit:
             conn.rollback()
         raise
 
+def atomic_replace_load(
+    conn: psycopg2.extensions.connection,
+    target_table: str,
+    columns: List[str],
+    select_query: str,
+    params: Optional[Union[Tuple, Dict[str, Any]]] = None,
+    analyze: bool = False
+) -> int:
+    """
+    Replace the contents of a table with the result of a query in one transaction.
+    
+    The old rows are removed with DELETE and the new rows inserted before a single
+    commit, so readers see either the old or the new contents and a failed load leaves
+    the target untouched. Unlike TRUNCATE, nothing commits until the insert is done.
+    The table itself is kept, so its grants, column defaults and dependent views are
+    unaffected.
+    
+    Args:
+        conn: psycopg2 connection
+        target_table: Schema-qualified name of the table to replace
+        columns: Target columns filled by the query, in select-list order
+        select_query: SELECT producing the new rows
+        params: Query parameters for select_query (optional)
+        analyze: Whether to refresh the table's planner statistics after the load (default: False)
+    
+    Returns:
+        Number of rows loaded
+    
+    Raises:
+        Exception: If the load fails
+    """
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"delete from {target_table};")
+            cursor.execute(f"insert into {target_table} ({', '.join(columns)}) {select_query}", params)
+            row_count = cursor.rowcount
+            if analyze:
+                cursor.execute(f"analyze {target_table};")
+            conn.commit()
+        
+        logger.info("Successfully replaced %s with %s rows", target_table, row_count)
+        return row_count
+    except Exception as e:
+        logger.error("Error replacing data in %s: %s", target_table, e)
+        conn.rollback()
+        raise
+
 def fetch_all(
     conn: psycopg2.extensions.connection,
     query: str,
@@ -148,22 +329,21 @@ def fetch_all(
         Exception: If the query cannot be executed
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
+        with conn.cursor() as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
         
-        rows = cursor.fetchall()
-        cursor.close()
-        
-        logger.info(f"Successfully fetched {len(rows)} rows")
+        logger.info("Successfully fetched %d rows", len(rows))
         return rows
     except Exception as e:
-        logger.error(f"Error fetching rows: {str(e)}")
+        logger.error("Error fetching rows: %s", e)
         raise
 
 def fetch_one(
     conn: psycopg2.extensions.connection,
     query: str,
-    params: Optional[Union[Tuple, Dict[str, Any]]] = None
+    params: Optional[Union[Tuple, Dict[str, Any]]] = None,
+    commit: bool = False
 ) -> Optional[Tuple]:
     """
     Fetch one row from a query on a Redshift database.
@@ -172,6 +352,7 @@ def fetch_one(
         conn: psycopg2 connection
         query: SQL query
         params: Query parameters (optional)
+        commit: Whether to commit the transaction, for queries that also modify data (default: False)
         
     Returns:
         Row or None if no rows are returned
@@ -180,11 +361,12 @@ def fetch_one(
         Exception: If the query cannot be executed
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        
-        row = cursor.fetchone()
-        cursor.close()
+        with conn.cursor() as cursor:
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            
+            if commit:
+                conn.commit()
         
         if row:
             logger.info("Successfully fetched one row")
@@ -193,36 +375,129 @@ def fetch_one(
             
         return row
     except Exception as e:
-        logger.error(f"Error fetching row: {str(e)}")
+        logger.error("Error fetching row: %s", e)
+        if commit:
+            conn.rollback()
+        raise
+
+def fetch_stream(
+    conn: psycopg2.extensions.connection,
+    query: str,
+    params: Optional[Union[Tuple, Dict[str, Any]]] = None,
+    itersize: int = 1000
+) -> Iterator[Tuple]:
+    """
+    Stream the rows of a query on a Redshift database through a server-side cursor.
+    
+    Rows are fetched ``itersize`` at a time, so client memory stays flat however large
+    the result is. The cursor lives inside the connection's current transaction. For
+    exports, prefer copy_to_s3, which UNLOADs without going through the client.
+    
+    Args:
+        conn: psycopg2 connection
+        query: SQL query
+        params: Query parameters (optional)
+        itersize: Number of rows fetched per round trip (default: 1000)
+        
+    Yields:
+        Rows
+        
+    Raises:
+        Exception: If the query cannot be executed
+    """
+    row_count = 0
+    try:
+        with conn.cursor(name=f"fetch_stream_{next(_CURSOR_IDS)}") as cursor:
+            cursor.itersize = itersize
+            cursor.execute(query, params)
+            for row in cursor:
+                row_count += 1
+                yield row
+        
+        logger.info("Successfully streamed %d rows", row_count)
+    except Exception as e:
+        logger.error("Error streaming rows: %s", e)
         raise
 
+def _connectorx_uri(conn: psycopg2.extensions.connection) -> str:
+    """
+    Build a connectorx Redshift connection URI from an open psycopg2 connection.
+    
+    Args:
+        conn: psycopg2 connection
+        
+    Returns:
+        Connection URI
+    """
+    dsn = conn.get_dsn_parameters()
+    user = quote(dsn['user'], safe='')
+    password = quote(conn.info.password or '', safe='')
+    return f"redshift://{user}:{password}@{dsn['host']}:{dsn['port']}/{dsn['dbname']}"
+
 def fetch_as_dataframe(
     conn: psycopg2.extensions.connection,
     query: str,
-    params: Optional[Union[Tuple, Dict[str, Any]]] = None
-) -> pd.DataFrame:
+    params: Optional[Union[Tuple, Dict[str, Any]]] = None,
+    use_connectorx: bool = False,
+    partition_on: Optional[str] = None,
+    partition_num: int = 4
+) -> 'pd.DataFrame':
     """
     Fetch query results as a pandas DataFrame.
     
+    By default the query runs through the cursor on conn. With use_connectorx, a query
+    without parameters is instead read by connectorx straight into columnar buffers.
+    connectorx opens its own connection, so it cannot see this session's temp tables,
+    uncommitted writes or search_path, and its column dtypes can differ from the
+    cursor path; only use it for reads of committed, fully qualified tables.
+    
     Args:
         conn: psycopg2 connection
         query: SQL query
         params: Query parameters (optional)
+        use_connectorx: Read through connectorx when params is None (default: False)
+        partition_on: Numeric column used by connectorx to split the read (optional)
+        partition_num: Number of partitions read in parallel when partition_on is set (default: 4)
         
     Returns:
         pandas DataFrame
         
     Raises:
+        ImportError: If use_connectorx is set and connectorx is not installed
         Exception: If the query cannot be executed
     """
+    # pandas is only needed here, so keep it off the module import path
+    import pandas as pd
+    
     try:
-        # Use pandas to execute the query and return a DataFrame
-        df = pd.read_sql_query(query, conn, params=params)
+        if use_connectorx and params is None:
+            if not CONNECTORX_AVAILABLE:
+                raise ImportError("connectorx is not installed. Install it with 'pip install connectorx'")
+            import connectorx
+            
+            read_kwargs = {'return_type': 'pandas'}
+            if partition_on:
+                read_kwargs.update(partition_on=partition_on, partition_num=partition_num)
+            
+            df = connectorx.read_sql(_connectorx_uri(conn), query.strip().rstrip(';'), **read_kwargs)
+            
+            logger.info("Successfully fetched %d rows as DataFrame", len(df))
+            return df
         
-        logger.info(f"Successfully fetched {len(df)} rows as DataFrame")
+        # Redshift does not support COPY ... TO STDOUT, so read through the cursor and
+        # build the DataFrame column-wise instead of going through pandas' SQL layer
+        with conn.cursor() as cursor:
+            cursor.execute(query, params)
+            column_names = [desc[0] for desc in cursor.description]
+            rows = cursor.fetchall()
+        
+        # Build positionally so duplicate column names each keep their own values
+        df = pd.DataFrame.from_records(rows, columns=column_names)
+        
+        logger.info("Successfully fetched %d rows as DataFrame", len(df))
         return df
     except Exception as e:
-        logger.error(f"Error fetching DataFrame: {str(e)}")
+        logger.error("Error fetching DataFrame: %s", e)
         raise
 
 def copy_to_s3(
@@ -251,8 +526,6 @@ def copy_to_s3(
         Exception: If the data cannot be copied
     """
     try:
-        cursor = conn.cursor()
-        
         # Build the UNLOAD command
         unload_command = f"""
         UNLOAD ('{query}')
@@ -264,20 +537,19 @@ def copy_to_s3(
         if options:
             unload_command += f" {options}"
         
-        # Execute the UNLOAD command
-        cursor.execute(unload_command)
-        conn.commit()
-        
-        # Get the number of rows unloaded
-        cursor.execute("SELECT pg_last_unload_count()")
-        row_count = cursor.fetchone()[0]
-        
-        cursor.close()
+        with conn.cursor() as cursor:
+            # Execute the UNLOAD command
+            cursor.execute(unload_command)
+            conn.commit()
+            
+            # Get the number of rows unloaded
+            cursor.execute("SELECT pg_last_unload_count()")
+            row_count = cursor.fetchone()[0]
         
-        logger.info(f"Successfully unloaded {row_count} rows to {s3_path}")
+        logger.info("Successfully unloaded %s rows to %s", row_count, s3_path)
         return row_count
     except Exception as e:
-        logger.error(f"Error copying data to S3: {str(e)}")
+        logger.error("Error copying data to S3: %s", e)
         conn.rollback()
         raise
 
@@ -307,8 +579,6 @@ def copy_from_s3(
         Exception: If the data cannot be copied
     """
     try:
-        cursor = conn.cursor()
-        
         # Build the COPY command
         copy_command = f"""
         COPY {table_name}
@@ -320,16 +590,16 @@ def copy_from_s3(
         if options:
             copy_command += f" {options}"
         
-        # Execute the COPY command
-        cursor.execute(copy_command)
-        conn.commit()
-        
-        row_count = cursor.rowcount
-        cursor.close()
+        with conn.cursor() as cursor:
+            # Execute the COPY command
+            cursor.execute(copy_command)
+            conn.commit()
+            
+            row_count = cursor.rowcount
         
-        logger.info(f"Successfully loaded {row_count} rows from {s3_path} to {table_name}")
+        logger.info("Successfully loaded %s rows from %s to %s", row_count, s3_path, table_name)
         return row_count
     except Exception as e:
-        logger.error(f"Error copying data from S3: {str(e)}")
+        logger.error("Error copying data from S3: %s", e)
         conn.rollback()
         raise
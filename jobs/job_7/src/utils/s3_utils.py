@@ -2,12 +2,29 @@
 S3 utility functions for AWS Glue Python Shell jobs.
 """
 import boto3
+import concurrent.futures
+import io
 import logging
-from typing import Tuple, Optional, Dict, Any, BinaryIO, Union
+from typing import Tuple, Optional, Dict, Any, BinaryIO, Iterable, Iterator, List, Union
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
+from src.utils import aws_clients
+
 logger = logging.getLogger(__name__)
 
+# DeleteObjects accepts at most 1000 keys per call
+_DELETE_OBJECTS_MAX_KEYS = 1000
+
+# Objects at or above this size are transferred as parallel 8 MB parts
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=MULTIPART_THRESHOLD,
+    max_concurrency=8,
+    use_threads=True
+)
+
 def parse_s3_path(s3_path: str) -> Tuple[str, str]:
     """
     Parse S3 path into bucket and key.
@@ -18,26 +35,28 @@ def parse_s3_path(s3_path: str) -> Tuple[str, str]:
     Returns:
         Tuple containing (bucket_name, key)
     """
-    if s3_path.startswith('s3://'):
-        s3_path = s3_path[5:]
-    
-    parts = s3_path.split('/', 1)
-    bucket = parts[0]
-    key = parts[1] if len(parts) > 1 else ''
-    
+    bucket, _, key = s3_path.removeprefix('s3://').partition('/')
     return bucket, key
 
 def get_s3_client(region_name: Optional[str] = None) -> boto3.client:
     """
     Get an S3 client.
     
+    The client is created on first use for each region and reused afterwards.
+    
     Args:
         region_name: AWS region name (optional)
         
     Returns:
         boto3 S3 client
     """
-    return boto3.client('s3', region_name=region_name)
+    return aws_clients.get_client('s3', region_name)
+
+def reset_client_cache() -> None:
+    """
+    Drop the cached S3 clients, e.g. in a forked process or between tests.
+    """
+    aws_clients.reset_client_cache('s3')
 
 def get_s3_object(bucket: str, key: str, region_name: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -57,16 +76,19 @@ def get_s3_object(bucket: str, key: str, region_name: Optional[str] = None) -> D
     try:
         s3_client = get_s3_client(region_name)
         response = s3_client.get_object(Bucket=bucket, Key=key)
-        logger.info(f"Successfully retrieved object from s3://{bucket}/{key}")
+        logger.info("Successfully retrieved object from s3://%s/%s", bucket, key)
         return response
     except ClientError as e:
-        logger.error(f"Error getting object from S3: {str(e)}")
+        logger.error("Error getting object from S3: %s", e)
         raise
 
 def read_s3_file_to_string(bucket: str, key: str, encoding: str = 'utf-8', region_name: Optional[str] = None) -> str:
     """
     Read an S3 file to a string.
     
+    The transfer manager reads files smaller than MULTIPART_THRESHOLD with a single
+    GET and downloads larger ones as parallel byte-range GETs.
+    
     Args:
         bucket: S3 bucket name
         key: S3 object key
@@ -76,26 +98,66 @@ def read_s3_file_to_string(bucket: str, key: str, encoding: str = 'utf-8', regio
     Returns:
         File content as string
         
+    Raises:
+        ClientError: If the file cannot be read
+    """
+    try:
+        s3_client = get_s3_client(region_name)
+        buffer = io.BytesIO()
+        s3_client.download_fileobj(bucket, key, buffer, Config=_TRANSFER_CONFIG)
+        logger.info("Successfully downloaded %d bytes from s3://%s/%s", buffer.tell(), bucket, key)
+        return buffer.getvalue().decode(encoding)
+    except ClientError as e:
+        logger.error("Error downloading object from S3: %s", e)
+        raise
+
+def iter_s3_file(bucket: str, key: str, chunk_size: int = 1024 * 1024,
+                 region_name: Optional[str] = None) -> Iterator[bytes]:
+    """
+    Stream an S3 file in chunks instead of reading it into memory at once.
+    
+    For text, wrap it with codecs.iterdecode(iter_s3_file(...), encoding) to parse the
+    file incrementally.
+    
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        chunk_size: Number of bytes per chunk (default: 1 MB)
+        region_name: AWS region name (optional)
+        
+    Yields:
+        Chunks of the file content
+        
     Raises:
         ClientError: If the file cannot be read
     """
     response = get_s3_object(bucket, key, region_name)
-    return response['Body'].read().decode(encoding)
+    body = response['Body']
+    try:
+        yield from body.iter_chunks(chunk_size)
+    finally:
+        body.close()
 
 def put_s3_object(bucket: str, key: str, body: Union[str, bytes, BinaryIO], 
-                  content_type: Optional[str] = None, region_name: Optional[str] = None) -> Dict[str, Any]:
+                  content_type: Optional[str] = None, region_name: Optional[str] = None,
+                  chunk_size: int = MULTIPART_THRESHOLD, max_concurrency: int = 8) -> Dict[str, Any]:
     """
     Put an object in S3.
     
+    Bodies of at least chunk_size bytes, and file objects, are uploaded as a multipart
+    upload with up to max_concurrency parts in flight; smaller bodies use a single PutObject.
+    
     Args:
         bucket: S3 bucket name
         key: S3 object key
         body: Object content
         content_type: Content type (optional)
         region_name: AWS region name (optional)
+        chunk_size: Multipart threshold and part size in bytes (default: 8 MB)
+        max_concurrency: Maximum parts uploaded in parallel (default: 8)
         
     Returns:
-        S3 put_object response
+        S3 put_object response (empty for multipart uploads, which return none)
         
     Raises:
         ClientError: If the object cannot be put
@@ -103,42 +165,89 @@ def put_s3_object(bucket: str, key: str, body: Union[str, bytes, BinaryIO],
     try:
         s3_client = get_s3_client(region_name)
         
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        
+        if not isinstance(body, bytes) or len(body) >= chunk_size:
+            fileobj = io.BytesIO(body) if isinstance(body, bytes) else body
+            transfer_config = TransferConfig(
+                multipart_threshold=chunk_size,
+                multipart_chunksize=chunk_size,
+                max_concurrency=max_concurrency,
+                use_threads=True
+            )
+            extra_args = {'ContentType': content_type} if content_type else None
+            s3_client.upload_fileobj(fileobj, bucket, key, ExtraArgs=extra_args, Config=transfer_config)
+            logger.info("Successfully uploaded object to s3://%s/%s", bucket, key)
+            return {}
+        
         # Build put_object kwargs
         put_kwargs = {'Bucket': bucket, 'Key': key, 'Body': body}
         if content_type:
             put_kwargs['ContentType'] = content_type
             
         response = s3_client.put_object(**put_kwargs)
-        logger.info(f"Successfully uploaded object to s3://{bucket}/{key}")
+        logger.info("Successfully uploaded object to s3://%s/%s", bucket, key)
         return response
     except ClientError as e:
-        logger.error(f"Error putting object to S3: {str(e)}")
+        logger.error("Error putting object to S3: %s", e)
         raise
 
-def list_s3_objects(bucket: str, prefix: str = '', region_name: Optional[str] = None) -> Dict[str, Any]:
+def iter_s3_objects(bucket: str, prefix: str = '', page_size: int = 1000,
+                    region_name: Optional[str] = None) -> Iterator[Dict[str, Any]]:
     """
-    List objects in an S3 bucket with a given prefix.
+    Iterate over the objects in an S3 bucket with a given prefix, one page at a time.
     
     Args:
         bucket: S3 bucket name
         prefix: S3 prefix (optional)
+        page_size: Number of keys requested per page (default: 1000)
         region_name: AWS region name (optional)
         
-    Returns:
-        S3 list_objects_v2 response
+    Yields:
+        Object summaries (the Contents entries of list_objects_v2)
         
     Raises:
         ClientError: If the objects cannot be listed
     """
     try:
         s3_client = get_s3_client(region_name)
-        response = s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
-        logger.info(f"Successfully listed objects in s3://{bucket}/{prefix}")
-        return response
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix,
+                                       PaginationConfig={'PageSize': page_size}):
+            yield from page.get('Contents', [])
     except ClientError as e:
-        logger.error(f"Error listing objects in S3: {str(e)}")
+        logger.error("Error listing objects in S3: %s", e)
         raise
 
+def list_s3_objects(bucket: str, prefix: str = '', region_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    List objects in an S3 bucket with a given prefix.
+    
+    Every page is read, so the result is no longer capped at 1000 keys; use
+    iter_s3_objects to stream large listings instead.
+    
+    Args:
+        bucket: S3 bucket name
+        prefix: S3 prefix (optional)
+        region_name: AWS region name (optional)
+        
+    Returns:
+        list_objects_v2-style response with the Contents of every page
+        
+    Raises:
+        ClientError: If the objects cannot be listed
+    """
+    contents = list(iter_s3_objects(bucket, prefix, region_name=region_name))
+    logger.info("Successfully listed objects in s3://%s/%s", bucket, prefix)
+    return {
+        'Name': bucket,
+        'Prefix': prefix,
+        'Contents': contents,
+        'KeyCount': len(contents),
+        'IsTruncated': False
+    }
+
 def copy_s3_object(source_bucket: str, source_key: str, 
                   dest_bucket: str, dest_key: str, 
                   region_name: Optional[str] = None) -> Dict[str, Any]:
@@ -165,10 +274,10 @@ def copy_s3_object(source_bucket: str, source_key: str,
             Bucket=dest_bucket,
             Key=dest_key
         )
-        logger.info(f"Successfully copied s3://{source_bucket}/{source_key} to s3://{dest_bucket}/{dest_key}")
+        logger.info("Successfully copied s3://%s/%s to s3://%s/%s", source_bucket, source_key, dest_bucket, dest_key)
         return response
     except ClientError as e:
-        logger.error(f"Error copying object in S3: {str(e)}")
+        logger.error("Error copying object in S3: %s", e)
         raise
 
 def delete_s3_object(bucket: str, key: str, region_name: Optional[str] = None) -> Dict[str, Any]:
@@ -189,8 +298,83 @@ def delete_s3_object(bucket: str, key: str, region_name: Optional[str] = None) -
     try:
         s3_client = get_s3_client(region_name)
         response = s3_client.delete_object(Bucket=bucket, Key=key)
-        logger.info(f"Successfully deleted object s3://{bucket}/{key}")
+        logger.info("Successfully deleted object s3://%s/%s", bucket, key)
         return response
     except ClientError as e:
-        logger.error(f"Error deleting object from S3: {str(e)}")
+        logger.error("Error deleting object from S3: %s", e)
+        raise
+
+def delete_s3_objects(bucket: str, keys: Iterable[str], region_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Delete many objects from an S3 bucket, up to 1000 keys per DeleteObjects call.
+    
+    Args:
+        bucket: S3 bucket name
+        keys: S3 object keys
+        region_name: AWS region name (optional)
+        
+    Returns:
+        List of per-key errors reported by S3 (empty if every key was deleted)
+        
+    Raises:
+        ClientError: If a DeleteObjects call fails
+    """
+    try:
+        s3_client = get_s3_client(region_name)
+        keys = list(keys)
+        errors = []
+        
+        for i in range(0, len(keys), _DELETE_OBJECTS_MAX_KEYS):
+            chunk = keys[i:i + _DELETE_OBJECTS_MAX_KEYS]
+            response = s3_client.delete_objects(
+                Bucket=bucket,
+                Delete={'Objects': [{'Key': key} for key in chunk], 'Quiet': True}
+            )
+            errors.extend(response.get('Errors', []))
+        
+        if errors:
+            logger.warning("Failed to delete %d objects from s3://%s", len(errors), bucket)
+        logger.info("Successfully deleted %d objects from s3://%s", len(keys) - len(errors), bucket)
+        return errors
+    except ClientError as e:
+        logger.error("Error deleting objects from S3: %s", e)
+        raise
+
+def copy_s3_objects(pairs: Iterable[Tuple[str, str, str, str]], max_workers: int = 16,
+                    region_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Copy many objects within S3 in parallel.
+    
+    The copies share one cached client, whose connection pool (AWS_MAX_POOL_CONNECTIONS,
+    64 by default) should be at least max_workers to avoid waiting for a free connection.
+    
+    Args:
+        pairs: (source_bucket, source_key, dest_bucket, dest_key) tuples
+        max_workers: Maximum number of copies in flight (default: 16)
+        region_name: AWS region name (optional)
+        
+    Returns:
+        List of S3 copy_object responses, in the order of pairs
+        
+    Raises:
+        ClientError: If any object cannot be copied
+    """
+    try:
+        s3_client = get_s3_client(region_name)
+        
+        def copy(pair: Tuple[str, str, str, str]) -> Dict[str, Any]:
+            source_bucket, source_key, dest_bucket, dest_key = pair
+            return s3_client.copy_object(
+                CopySource={'Bucket': source_bucket, 'Key': source_key},
+                Bucket=dest_bucket,
+                Key=dest_key
+            )
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = list(executor.map(copy, pairs))
+        
+        logger.info("Successfully copied %d objects", len(responses))
+        return responses
+    except ClientError as e:
+        logger.error("Error copying objects in S3: %s", e)
         raise
@@ -2,27 +2,205 @@
 SSM Parameter Store utility functions for AWS Glue Python Shell jobs.
 """
 import boto3
+import concurrent.futures
+import contextlib
 import logging
-from typing import Dict, Any, List, Optional, Union
+import os
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+
+from src.utils import aws_clients
 
 logger = logging.getLogger(__name__)
 
+# GetParameters accepts at most 10 names per call
+_GET_PARAMETERS_MAX_NAMES = 10
+
+# Batcher that get_parameter delegates to inside a `with batch():` block
+_BATCHER: Optional['BatchingSSMLoader'] = None
+
+# Parameter values cached in process: key -> (fetched_at, value). Keys are
+# ('param', name, with_decryption, region_name) and
+# ('path', path, recursive, with_decryption, region_name). A TTL of 0 disables caching.
+SSM_CACHE_TTL = float(os.environ.get('SSM_CACHE_TTL', '300'))
+_CACHE_MAXSIZE = 1024
+_CACHE: Dict[Tuple, Tuple[float, Any]] = {}
+_CACHE_LOCK = threading.Lock()
+_MISSING = object()
+
+def _cache_get(key: Tuple) -> Any:
+    """
+    Return a cached value fetched within the last SSM_CACHE_TTL seconds, or _MISSING.
+    """
+    entry = _CACHE.get(key)
+    if entry is not None and time.monotonic() - entry[0] < SSM_CACHE_TTL:
+        return entry[1]
+    return _MISSING
+
+def _cache_set(key: Tuple, value: Any) -> None:
+    """
+    Cache a value, evicting the oldest entry when the cache is full.
+    """
+    if SSM_CACHE_TTL <= 0:
+        return
+    with _CACHE_LOCK:
+        _CACHE.pop(key, None)
+        if len(_CACHE) >= _CACHE_MAXSIZE:
+            _CACHE.pop(next(iter(_CACHE)))
+        _CACHE[key] = (time.monotonic(), value)
+
+def _cache_invalidate(name: str) -> None:
+    """
+    Drop cached entries for a parameter and every cached path lookup.
+    """
+    with _CACHE_LOCK:
+        for key in [k for k in _CACHE if k[0] == 'path' or k[1] == name]:
+            del _CACHE[key]
+
+def clear_cache() -> None:
+    """
+    Drop every cached parameter value.
+    """
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
 def get_ssm_client(region_name: Optional[str] = None) -> boto3.client:
     """
     Get an SSM client.
     
+    The client is created on first use for each region and reused afterwards.
+    
     Args:
         region_name: AWS region name (optional)
         
     Returns:
         boto3 SSM client
     """
-    return boto3.client('ssm', region_name=region_name)
+    return aws_clients.get_client('ssm', region_name)
+
+def reset_client_cache() -> None:
+    """
+    Drop the cached SSM clients, e.g. in a forked process or between tests.
+    """
+    aws_clients.reset_client_cache('ssm')
+
+class BatchingSSMLoader:
+    """
+    Coalesce concurrent parameter lookups into GetParameters calls.
+    
+    Names submitted within a short window are queued and fetched together, up to 10 per
+    call, instead of one GetParameter call each. Each submit returns a future that
+    resolves to the parameter value.
+    """
+    
+    def __init__(self, window: float = 0.005, region_name: Optional[str] = None):
+        """
+        Initialize the batcher.
+        
+        Args:
+            window: Seconds to wait for more names before flushing (default: 0.005)
+            region_name: AWS region name (optional)
+        """
+        self.window = window
+        self.region_name = region_name
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, bool], concurrent.futures.Future] = {}
+        self._timer: Optional[threading.Timer] = None
+    
+    def submit(self, name: str, with_decryption: bool = True) -> concurrent.futures.Future:
+        """
+        Queue a parameter lookup.
+        
+        Args:
+            name: Parameter name
+            with_decryption: Whether to decrypt the parameter (default: True)
+            
+        Returns:
+            Future resolving to the parameter value
+        """
+        with self._lock:
+            future = self._pending.get((name, with_decryption))
+            if future is None:
+                future = concurrent.futures.Future()
+                self._pending[(name, with_decryption)] = future
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return future
+    
+    def flush(self) -> None:
+        """
+        Fetch every queued lookup now.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        
+        for with_decryption in (True, False):
+            names = [name for name, decrypt in pending if decrypt == with_decryption]
+            for i in range(0, len(names), _GET_PARAMETERS_MAX_NAMES):
+                chunk = names[i:i + _GET_PARAMETERS_MAX_NAMES]
+                futures = {name: pending[(name, with_decryption)] for name in chunk}
+                try:
+                    response = get_ssm_client(self.region_name).get_parameters(
+                        Names=chunk,
+                        WithDecryption=with_decryption
+                    )
+                    for param in response['Parameters']:
+                        # SSM reports a "name:version" lookup under its bare name plus a
+                        # Selector, and an ARN lookup under its name, so try each form
+                        for key in (param['Name'] + param.get('Selector', ''), param['Name'], param.get('ARN')):
+                            future = futures.pop(key, None)
+                            if future is not None:
+                                future.set_result(param['Value'])
+                                break
+                    logger.info("Successfully retrieved %d parameters in one batch", len(chunk))
+                except Exception as e:
+                    logger.error("Error getting parameters %s: %s", chunk, e)
+                    for future in futures.values():
+                        if not future.done():
+                            future.set_exception(e)
+                    futures = {}
+                finally:
+                    # Every queued future must resolve, or its caller blocks forever
+                    for name, future in futures.items():
+                        if not future.done():
+                            future.set_exception(ValueError(f"Invalid parameter: {name}"))
+
+@contextlib.contextmanager
+def batch(window: float = 0.005, region_name: Optional[str] = None) -> Iterator[BatchingSSMLoader]:
+    """
+    Route get_parameter calls from any thread through a BatchingSSMLoader for the block.
+    
+    Lookups only coalesce when they are made concurrently, e.g. from a thread pool.
+    
+    Args:
+        window: Seconds to wait for more names before flushing (default: 0.005)
+        region_name: AWS region name (optional)
+        
+    Yields:
+        The active BatchingSSMLoader
+    """
+    global _BATCHER
+    previous = _BATCHER
+    _BATCHER = BatchingSSMLoader(window, region_name)
+    try:
+        yield _BATCHER
+    finally:
+        _BATCHER.flush()
+        _BATCHER = previous
 
 def get_parameter(name: str, with_decryption: bool = True, region_name: Optional[str] = None) -> str:
     """
     Get a parameter from SSM Parameter Store.
     
+    Values are cached in process for SSM_CACHE_TTL seconds (env var SSM_CACHE_TTL,
+    default 300).
+    
     Args:
         name: Parameter name
         with_decryption: Whether to decrypt the parameter (default: True)
@@ -34,16 +212,29 @@ def get_parameter(name: str, with_decryption: bool = True, region_name: Optional
     Raises:
         Exception: If the parameter cannot be retrieved
     """
+    cache_key = ('param', name, with_decryption, region_name)
+    value = _cache_get(cache_key)
+    if value is not _MISSING:
+        return value
+    
+    batcher = _BATCHER
+    if batcher is not None and batcher.region_name == region_name:
+        value = batcher.submit(name, with_decryption).result()
+        _cache_set(cache_key, value)
+        return value
+    
     try:
         ssm_client = get_ssm_client(region_name)
         response = ssm_client.get_parameter(
             Name=name,
             WithDecryption=with_decryption
         )
-        logger.info(f"Successfully retrieved parameter: {name}")
-        return response['Parameter']['Value']
+        logger.info("Successfully retrieved parameter: %s", name)
+        value = response['Parameter']['Value']
+        _cache_set(cache_key, value)
+        return value
     except Exception as e:
-        logger.error(f"Error getting parameter {name}: {str(e)}")
+        logger.error("Error getting parameter %s: %s", name, e)
         raise
 
 def get_parameters(names: List[str], with_decryption: bool = True, region_name: Optional[str] = None) -> Dict[str, str]:
@@ -62,23 +253,38 @@ def get_parameters(names: List[str], with_decryption: bool = True, region_name:
         Exception: If the parameters cannot be retrieved
     """
     try:
+        # Serve what we can from the cache and only fetch the rest
+        parameters = {}
+        missing = []
+        for name in names:
+            value = _cache_get(('param', name, with_decryption, region_name))
+            if value is _MISSING:
+                missing.append(name)
+            else:
+                parameters[name] = value
+        
+        if not missing:
+            return parameters
+        
         ssm_client = get_ssm_client(region_name)
         response = ssm_client.get_parameters(
-            Names=names,
+            Names=missing,
             WithDecryption=with_decryption
         )
         
         # Check if any parameters were not found
         if response['InvalidParameters']:
-            logger.warning(f"Invalid parameters: {response['InvalidParameters']}")
+            logger.warning("Invalid parameters: %s", response['InvalidParameters'])
         
-        # Create a dictionary of parameter names and values
-        parameters = {param['Name']: param['Value'] for param in response['Parameters']}
+        # Add the fetched parameter names and values
+        for param in response['Parameters']:
+            parameters[param['Name']] = param['Value']
+            _cache_set(('param', param['Name'], with_decryption, region_name), param['Value'])
         
-        logger.info(f"Successfully retrieved {len(parameters)} parameters")
+        logger.info("Successfully retrieved %d parameters", len(parameters))
         return parameters
     except Exception as e:
-        logger.error(f"Error getting parameters {names}: {str(e)}")
+        logger.error("Error getting parameters %s: %s", names, e)
         raise
 
 def get_parameters_by_path(path: str, recursive: bool = True, with_decryption: bool = True, 
@@ -98,6 +304,11 @@ def get_parameters_by_path(path: str, recursive: bool = True, with_decryption: b
     Raises:
         Exception: If the parameters cannot be retrieved
     """
+    cache_key = ('path', path, recursive, with_decryption, region_name)
+    cached = _cache_get(cache_key)
+    if cached is not _MISSING:
+        return dict(cached)
+    
     try:
         ssm_client = get_ssm_client(region_name)
         parameters = {}
@@ -115,12 +326,45 @@ def get_parameters_by_path(path: str, recursive: bool = True, with_decryption: b
             for param in page['Parameters']:
                 parameters[param['Name']] = param['Value']
         
-        logger.info(f"Successfully retrieved {len(parameters)} parameters from path {path}")
+        logger.info("Successfully retrieved %d parameters from path %s", len(parameters), path)
+        _cache_set(cache_key, dict(parameters))
         return parameters
     except Exception as e:
-        logger.error(f"Error getting parameters from path {path}: {str(e)}")
+        logger.error("Error getting parameters from path %s: %s", path, e)
         raise
 
+def get_parameters_by_paths(paths: List[str], recursive: bool = True, with_decryption: bool = True,
+                           region_name: Optional[str] = None, max_workers: int = 8) -> Dict[str, str]:
+    """
+    Get parameters under several paths from SSM Parameter Store concurrently.
+    
+    The pages of one path are chained by NextToken and have to be fetched in order, so
+    the concurrency is across paths: each path is walked by get_parameters_by_path on a
+    thread of a shared pool.
+    
+    Args:
+        paths: Parameter paths
+        recursive: Whether to retrieve parameters recursively (default: True)
+        with_decryption: Whether to decrypt the parameters (default: True)
+        region_name: AWS region name (optional)
+        max_workers: Maximum number of paths fetched at once (default: 8)
+        
+    Returns:
+        Dictionary of parameter names and values from every path
+        
+    Raises:
+        Exception: If the parameters under any path cannot be retrieved
+    """
+    parameters = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(get_parameters_by_path, path, recursive, with_decryption, region_name)
+            for path in paths
+        ]
+        for future in futures:
+            parameters.update(future.result())
+    return parameters
+
 def put_parameter(name: str, value: str, description: Optional[str] = None, 
                  param_type: str = 'String', overwrite: bool = True, 
                  region_name: Optional[str] = None) -> Dict[str, Any]:
@@ -156,10 +400,11 @@ def put_parameter(name: str, value: str, description: Optional[str] = None,
             put_kwargs['Description'] = description
             
         response = ssm_client.put_parameter(**put_kwargs)
-        logger.info(f"Successfully put parameter: {name}")
+        _cache_invalidate(name)
+        logger.info("Successfully put parameter: %s", name)
         return response
     except Exception as e:
-        logger.error(f"Error putting parameter {name}: {str(e)}")
+        logger.error("Error putting parameter %s: %s", name, e)
         raise
 
 def delete_parameter(name: str, region_name: Optional[str] = None) -> Dict[str, Any]:
@@ -179,8 +424,9 @@ def delete_parameter(name: str, region_name: Optional[str] = None) -> Dict[str,
     try:
         ssm_client = get_ssm_client(region_name)
         response = ssm_client.delete_parameter(Name=name)
-        logger.info(f"Successfully deleted parameter: {name}")
+        _cache_invalidate(name)
+        logger.info("Successfully deleted parameter: %s", name)
         return response
     except Exception as e:
-        logger.error(f"Error deleting parameter {name}: {str(e)}")
+        logger.error("Error deleting parameter %s: %s", name, e)
         raise
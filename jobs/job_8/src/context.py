@@ -238,29 +238,45 @@ Context variables for the Job_EDW_ST_CNSMPTN_CMN_DIM_US_STG_TO_SUBS_DTL job.
 This module defines all context variables used in the job, mirroring the Talend context variables.
 """
 import os
+import re
 import json
 import logging
 import datetime
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Tuple, Union
 
 from src.utils import s3_utils
 
 logger = logging.getLogger(__name__)
 
+# key=value lines of a .properties file; comment lines start with '#'
+_PROPERTY_RE = re.compile(r'^[ \t]*([^#=\s][^=\n]*)=(.*)$', re.MULTILINE)
+
+# Parsed properties files, keyed by (path, mtime in ns)
+_PROPERTIES_CACHE: Dict[Tuple[str, int], Dict[str, str]] = {}
+
+# Characters a JSON document can start with; other env values are kept as plain strings
+_JSON_LEAD = frozenset('{["0123456789-tfn')
+
+
+def parse_properties(text: str) -> Dict[str, str]:
+    """
+    Parse the contents of a Java-style .properties file into a dict.
+    """
+    return {k.strip(): v.strip() for k, v in _PROPERTY_RE.findall(text)}
+
 
 def load_properties_file(file_path: str) -> Dict[str, str]:
     """
     Load a Java-style .properties file and return a dict.
+    The parsed result is cached until the file's modification time changes.
     """
     props = {}
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    if '=' in line:
-                        k, v = line.split('=', 1)
-                        props[k.strip()] = v.strip()
+        cache_key = (file_path, os.stat(file_path).st_mtime_ns)
+        if cache_key not in _PROPERTIES_CACHE:
+            with open(file_path, 'r') as f:
+                _PROPERTIES_CACHE[cache_key] = parse_properties(f.read())
+        props = dict(_PROPERTIES_CACHE[cache_key])
         logger.info(f"Loaded {len(props)} variables from properties file {file_path}")
     except Exception as e:
         logger.error(f"Error reading properties file {file_path}: {str(e)}")
@@ -275,17 +291,189 @@ class Context:
     that need to be shared across different parts of the job.
     """
 
-    def __init__(self):
-        # ... (unchanged init as you provided, omitted for brevity)
-        # Paste your original __init__ here
-        # See note below
+    # Every context variable is declared up front; set() only accepts these names
+    __slots__ = (
+        # Batch Audit Variables
+        'batch_audit_detail_ERR_REC_QTY',
+        'batch_audit_detail_FILE_NM',
+        'batch_audit_detail_FILE_RCVD_TS',
+        'batch_audit_detail_FILE_SIZE_IN_BYTES_QTY',
+        'batch_audit_detail_id',
+        'batch_audit_detail_INS_REC_QTY',
+        'batch_audit_detail_SRC_REC_QTY',
+        'batch_audit_detail_UPD_REC_QTY',
+        'batch_id',
+        'batch_detail_id',
+        'INS_REC_QTY',
+        'SRC_REC_QTY',
+        # Batch Configuration Variables
+        'batch_compare_date',
+        'batch_env',
+        'batch_folder_prefix',
+        'batch_job_name',
+        'batch_manifestjson',
+        'batch_process_date',
+        'batch_src_s3_file_delimiter',
+        'batch_src_s3_file_type',
+        'batch_src_tbl_name',
+        'batch_status',
+        'batch_subject_area_id',
+        'batch_tgt_tbl_name',
+        # Process Control Variables
+        'pc_cdc_field_nm',
+        'pc_end_exec_offset_hr_qty',
+        'pc_end_exec_ts',
+        'pc_interval_nm',
+        'pc_interval_qty',
+        'pc_is_idl_ind',
+        'pc_src_pltfrm_nm',
+        'pc_src_timezone_cd',
+        'pc_start_exec_offset_hr_qty',
+        'pc_start_exec_ts',
+        # File Configuration Variables
+        'file_log_file_nm',
+        'file_manifest_file_nm',
+        'file_inprogress_file_nm',
+        'file_complete_file_nm',
+        'file_status_file_nm',
+        'file_unique_filelist_nm',
+        # Integration Configuration Variables
+        'ic_business_email_addr_txt',
+        'ic_dept_nm',
+        'ic_division_nm',
+        'ic_etl_local_home_path_nm',
+        'ic_etl_log_path_nm',
+        'ic_etl_manifest_file_path_nm',
+        'ic_etl_param_file_path_nm',
+        'ic_etl_s3_bucket_nm',
+        'ic_etl_s3_home_path_nm',
+        'ic_is_multiple_source_ind',
+        'ic_subject_area_nm',
+        'ic_tech_email_addr_txt',
+        # Parameter Variables
+        'parameter_file_context_file_nm',
+        'parameter_file_local_context_path',
+        'parameter_workflow_name',
+        'parameter_dept_nm',
+        'parameter_division_nm',
+        'parameter_env',
+        'parameter_subject_area_nm',
+        # Job-Specific Variables
+        'from_dt',
+        'to_dt',
+        'db_edw_ods_schema',
+        'db_edw_datamart_schema',
+        'flow_path',
+        'stg_src_table',
+        'stg_table_dt_subs',
+        'stg_table_dt_subs_dtl',
+        'ods_table_subscription_link',
+        'start_est_dt',
+        'link_id',
+        'dt_subs_date_column',
+        'lookup_buffer_days',
+        'cutoff_process_nm',
+        'father_pid',
+        'message_type',
+        'pid',
+    )
+
+    # Names update() accepts, derived once from __slots__
+    _ALLOWED = frozenset(__slots__)
 
-        # Example for brevity (keep your full list):
+    def __init__(self):
+        """
+        Initialize context variables with default values.
+        """
+        # Batch Audit Variables
         self.batch_audit_detail_ERR_REC_QTY = 0
         self.batch_audit_detail_FILE_NM = "N/A"
         self.batch_audit_detail_FILE_RCVD_TS = None
         self.batch_audit_detail_FILE_SIZE_IN_BYTES_QTY = 0
-        # ...etc...
+        self.batch_audit_detail_id = 0
+        self.batch_audit_detail_INS_REC_QTY = 0
+        self.batch_audit_detail_SRC_REC_QTY = 0
+        self.batch_audit_detail_UPD_REC_QTY = 0
+        self.batch_id = 0
+        self.batch_detail_id = 0
+        self.INS_REC_QTY = 0
+        self.SRC_REC_QTY = 0
+        
+        # Batch Configuration Variables
+        self.batch_compare_date = False
+        self.batch_env = "dev"
+        self.batch_folder_prefix = ""
+        self.batch_job_name = "Job_EDW_ST_CNSMPTN_CMN_DIM_US_STG_TO_SUBS_DTL"
+        self.batch_manifestjson = ""
+        self.batch_process_date = datetime.datetime.now()
+        self.batch_src_s3_file_delimiter = ","
+        self.batch_src_s3_file_type = ""
+        self.batch_src_tbl_name = ""
+        self.batch_status = ""
+        self.batch_subject_area_id = "1"  # Default value, should be set from parameters
+        self.batch_tgt_tbl_name = ""
+        
+        # Process Control Variables
+        self.pc_cdc_field_nm = ""
+        self.pc_end_exec_offset_hr_qty = 0
+        self.pc_end_exec_ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.pc_interval_nm = ""
+        self.pc_interval_qty = 0
+        self.pc_is_idl_ind = "N"  # Default to non-IDL processing
+        self.pc_src_pltfrm_nm = ""
+        self.pc_src_timezone_cd = ""
+        self.pc_start_exec_offset_hr_qty = 0
+        self.pc_start_exec_ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        # File Configuration Variables
+        self.file_log_file_nm = "jobname_log.txt"
+        self.file_manifest_file_nm = ""
+        self.file_inprogress_file_nm = ""
+        self.file_complete_file_nm = ""
+        self.file_status_file_nm = "jobname_status.txt"
+        self.file_unique_filelist_nm = ""
+        
+        # Integration Configuration Variables
+        self.ic_business_email_addr_txt = ""
+        self.ic_dept_nm = ""
+        self.ic_division_nm = ""
+        self.ic_etl_local_home_path_nm = "/tmp/"
+        self.ic_etl_log_path_nm = ""
+        self.ic_etl_manifest_file_path_nm = ""
+        self.ic_etl_param_file_path_nm = ""
+        self.ic_etl_s3_bucket_nm = ""
+        self.ic_etl_s3_home_path_nm = ""
+        self.ic_is_multiple_source_ind = ""
+        self.ic_subject_area_nm = ""
+        self.ic_tech_email_addr_txt = ""
+        
+        # Parameter Variables
+        self.parameter_file_context_file_nm = "context.properties"
+        self.parameter_file_local_context_path = "/tmp/"
+        self.parameter_workflow_name = "Job_EDW_ST_CNSMPTN_CMN_DIM_US_STG_TO_SUBS_DTL"
+        self.parameter_dept_nm = ""
+        self.parameter_division_nm = ""
+        self.parameter_env = "dev"
+        self.parameter_subject_area_nm = ""
+        
+        # Job-Specific Variables
+        self.from_dt = ""
+        self.to_dt = ""
+        self.db_edw_ods_schema = "edw_ods"
+        self.db_edw_datamart_schema = "edw_datamart_stg"
+        self.flow_path = "CONSUMPTION"  # Default to CONSUMPTION path
+        self.stg_src_table = "edw_datamart_stg.stg_si_consumption"
+        self.stg_table_dt_subs = "edw_datamart_stg.stg_st_consumption_dt_subs"
+        self.stg_table_dt_subs_dtl = "edw_datamart_stg.stg_st_consumption_dt_subs_dtl"
+        self.ods_table_subscription_link = "consumption_subscription"
+        self.start_est_dt = "brdcst_start_est_dt"
+        self.link_id = "cnsmptn_id"
+        self.dt_subs_date_column = "brdcst_start_est_dt"
+        self.lookup_buffer_days = 7
+        self.cutoff_process_nm = "Fact_Summary"
+        self.father_pid = "0"
+        self.message_type = "info"
+        self.pid = "0"
 
     def set(self, name: str, value: Any) -> None:
         if hasattr(self, name):
@@ -298,8 +486,16 @@ class Context:
         return getattr(self, name, default)
 
     def update(self, variables: Dict[str, Any]) -> None:
+        unknown = []
         for name, value in variables.items():
-            self.set(name, value)
+            if name in self._ALLOWED:
+                setattr(self, name, value)
+            else:
+                unknown.append(name)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Context variables set: %s", ", ".join(n for n in variables if n in self._ALLOWED))
+        if unknown:
+            logger.warning("Attempted to set unknown context variables: %s", ", ".join(unknown))
 
     def remove(self, name: str) -> None:
         """
@@ -312,12 +508,16 @@ class Context:
             logger.warning(f"Tried to remove unknown variable '{name}'")
 
     def load_from_env(self, prefix: str = "", include: Optional[list] = None) -> None:
+        prefix_len = len(prefix)
         for key, value in os.environ.items():
             if prefix and not key.startswith(prefix):
                 continue
-            if include and key[len(prefix):] not in include:
+            context_key = key[prefix_len:]
+            if include and context_key not in include:
+                continue
+            if not value or value[0] not in _JSON_LEAD:
+                self.set(context_key, value)
                 continue
-            context_key = key[len(prefix):]
             try:
                 parsed_value = json.loads(value)
                 self.set(context_key, parsed_value)
@@ -364,13 +564,7 @@ class Context:
                 variables = json.loads(content)
             elif key.endswith(".properties"):
                 # Parse properties from string
-                variables = {}
-                for line in content.splitlines():
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        if '=' in line:
-                            k, v = line.split('=', 1)
-                            variables[k.strip()] = v.strip()
+                variables = parse_properties(content)
             else:
                 logger.error(f"Unsupported context file format in S3: {key}")
                 return
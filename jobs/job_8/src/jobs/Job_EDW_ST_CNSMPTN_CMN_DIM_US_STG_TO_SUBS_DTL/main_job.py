@@ -12,6 +12,10 @@ from src.utils import redshift_utils, logging_utils
 
 logger = logging.getLogger(__name__)
 
+# Cutoff dates already looked up, keyed by (cutoff process name, batch ID); the cutoff
+# does not change within a batch, so re-runs in the same process skip the query
+_CUTOFF_DATES_CACHE: Dict[Tuple[str, Any], Tuple[str, str]] = {}
+
 def set_date_range_idl(start_exec_ts: str, end_exec_ts: str) -> Tuple[str, str]:
     """
     Set date range for IDL processing.
@@ -24,9 +28,13 @@ def set_date_range_idl(start_exec_ts: str, end_exec_ts: str) -> Tuple[str, str]:
         Tuple of (from_dt, to_dt)
     """
     try:
-        # Parse timestamps and format as dates
-        from_dt = datetime.datetime.strptime(start_exec_ts, "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d")
-        to_dt = datetime.datetime.strptime(end_exec_ts, "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d")
+        # Timestamps are "YYYY-MM-DD HH:MM:SS", so the date is the first ten characters;
+        # fromisoformat validates it without strptime's format parsing
+        for exec_ts in (start_exec_ts, end_exec_ts):
+            if len(exec_ts) != 19:
+                raise ValueError(f"Invalid execution timestamp: {exec_ts}")
+        from_dt = datetime.date.fromisoformat(start_exec_ts[:10]).isoformat()
+        to_dt = datetime.date.fromisoformat(end_exec_ts[:10]).isoformat()
         
         logger.info(f"Set date range for IDL processing: {from_dt} to {to_dt}")
         return from_dt, to_dt
@@ -38,6 +46,8 @@ def get_cutoff_dates(conn) -> Tuple[str, str]:
     """
     Get cutoff dates for non-IDL processing.
     
+    The result is cached per cutoff process name and batch ID once a batch has started.
+    
     Args:
         conn: Redshift connection
         
@@ -48,43 +58,45 @@ def get_cutoff_dates(conn) -> Tuple[str, str]:
         Exception: If cutoff dates cannot be retrieved
     """
     try:
-        query = f"""
+        cache_key = (context.cutoff_process_nm, context.batch_id) if context.batch_id else None
+        if cache_key in _CUTOFF_DATES_CACHE:
+            from_dt, to_dt = _CUTOFF_DATES_CACHE[cache_key]
+            logger.info(f"Reusing cutoff dates for batch {context.batch_id}: {from_dt} to {to_dt}")
+            return from_dt, to_dt
+        
+        # Only the two dates are selected, so the cutoff MAX groups on the process
+        # control row alone rather than on every derived column
+        query = """
+        with pc as (
+        select start_exec_ts::date as start_exec_dt,
+        ADD_MONTHS(start_exec_ts, -1) as prev_month_dt
+        FROM edw_ods.process_control where process_nm=%(cutoff_process_nm)s
+        )
         SELECT 
-        start_exec_ts, start_exec_dt, cnsmptn_cutoff_dt,
-        CASE WHEN start_exec_dt<=dateadd(day,1,cnsmptn_cutoff_dt) 
-         THEN first_day_of_prev_month ELSE first_day_of_curr_month END as from_dt,
-        start_exec_dt as to_dt
-        FROM(
-        SELECT PC.*,
-        MAX(COFF.cnsmptn_cutoff_dt) cnsmptn_cutoff_dt
-        FROM
-        (
-        select start_exec_ts,
-        start_exec_ts::DATE as start_exec_dt,
-          ADD_MONTHS(start_exec_ts, -1) PREV_MONTH_DT,
-        date_part('year',ADD_MONTHS(start_exec_ts, -1))::integer as PREV_MONTH_YEAR,
-        date_part('month',ADD_MONTHS(start_exec_ts, -1))::integer as PREV_MONTH,
-        DATE_TRUNC('month', PREV_MONTH_DT)::date as  first_day_of_prev_month,
-        DATE_TRUNC('month', start_exec_ts)::date as first_day_of_curr_month, 
-        date_part('month',start_exec_ts)::integer as CURR_MONTH
-        FROM edw_ods.process_control where process_nm='{context.cutoff_process_nm}') PC
+        CASE WHEN pc.start_exec_dt<=dateadd(day,1,MAX(COFF.cnsmptn_cutoff_dt)) 
+         THEN DATE_TRUNC('month', pc.prev_month_dt)::date ELSE DATE_TRUNC('month', pc.start_exec_dt)::date END as from_dt,
+        pc.start_exec_dt as to_dt
+        FROM pc
         JOIN edw_ods.consumption_cutoff COFF
-        ON PC.PREV_MONTH_YEAR=COFF.brdcst_year_nbr
-        AND PC.PREV_MONTH=COFF.brdcst_month_nbr
-        GROUP BY 1,2,3,4,5,6,7,8
-        );
+        ON date_part('year',pc.prev_month_dt)::integer=COFF.brdcst_year_nbr
+        AND date_part('month',pc.prev_month_dt)::integer=COFF.brdcst_month_nbr
+        GROUP BY pc.start_exec_dt, pc.prev_month_dt;
         """
         
-        result = redshift_utils.fetch_one(conn, query)
+        params = {'cutoff_process_nm': context.cutoff_process_nm}
         
-        if result and len(result) >= 5:
-            from_dt = result[3]
-            to_dt = result[4]
+        result = redshift_utils.fetch_one(conn, query, params)
+        
+        if result and len(result) >= 2:
+            from_dt = result[0]
+            to_dt = result[1]
             
-            # Convert to string format
-            from_dt = from_dt.strftime("%Y-%m-%d") if isinstance(from_dt, datetime.date) else str(from_dt)
-            to_dt = to_dt.strftime("%Y-%m-%d") if isinstance(to_dt, datetime.date) else str(to_dt)
+            # Both columns are cast to date in the query, so str() is already YYYY-MM-DD
+            from_dt = str(from_dt)
+            to_dt = str(to_dt)
             
+            if cache_key:
+                _CUTOFF_DATES_CACHE[cache_key] = (from_dt, to_dt)
             logger.info(f"Retrieved cutoff dates: {from_dt} to {to_dt}")
             return from_dt, to_dt
         else:
@@ -94,7 +106,7 @@ def get_cutoff_dates(conn) -> Tuple[str, str]:
         logger.error(f"Failed to get cutoff dates: {str(e)}")
         raise
 
-def process_consumption_path(datamart_conn, from_dt: str, to_dt: str, lookup_buffer_days: int) -> None:
+def process_consumption_path(datamart_conn, from_dt: str, to_dt: str, lookup_buffer_days: int) -> int:
     """
     Process the CONSUMPTION path.
     
@@ -104,59 +116,83 @@ def process_consumption_path(datamart_conn, from_dt: str, to_dt: str, lookup_buf
         to_dt: End date
         lookup_buffer_days: Number of buffer days for lookup
         
+    Returns:
+        Number of rows loaded into the stage table
+        
     Raises:
         Exception: If processing fails
     """
     try:
-        # SQL query for CONSUMPTION path
+        # SQL query for CONSUMPTION path. Source records are counted per link before the
+        # subscription link join, so the join runs on the aggregated rows. The device with
+        # the most records per date, subscription and service is picked by row_number()
+        # over the grouped rows; ties keep the lowest device id, then subtype, so each
+        # output row is one complete source row.
         query = f"""
-        truncate table {context.stg_table_dt_subs};
+        drop table if exists tmp_st_device_dt_subs;
 
-        Insert into {context.stg_table_dt_subs}(
-        {context.dt_subs_date_column},
-        sbscrptn_key_id,
-        cnsmd_srvc_cd,
-        cnsumd_veh_device_id,
-        sbscrptn_subtype_prdct_catg_cd
-        )
-        select {context.dt_subs_date_column},
-        sbscrptn_key_id,
-        cnsmd_srvc_cd,
-        cnsumd_veh_device_id,
-        sbscrptn_subtype_prdct_catg_cd 
-        from(
-        select 
-        tmp.{context.dt_subs_date_column},
-        tmp.sbscrptn_key_id,
-        tmp.cnsmd_srvc_cd,
-        tmp.cnsumd_veh_device_id,
-        tmp.sbscrptn_subtype_prdct_catg_cd,
-        row_number() over(partition by tmp.{context.dt_subs_date_column},tmp.sbscrptn_key_id,tmp.cnsmd_srvc_cd order by tmp.rec_cnt desc) rnk
-        from(
-        SELECT distinct 
+        create temp table tmp_st_device_dt_subs
+        distkey(sbscrptn_key_id) sortkey({context.dt_subs_date_column}) as
+        SELECT 
         a.{context.dt_subs_date_column},
         b.sbscrptn_key_id,
         a.cnsmd_srvc_cd,
         a.device_id as cnsumd_veh_device_id,
         b.sbscrptn_subtype_prdct_catg_cd,
+        sum(a.rec_cnt) rec_cnt
+        FROM (
+        select {context.dt_subs_date_column},
+        {context.link_id},
+        cnsmd_srvc_cd,
+        device_id,
         count(1) rec_cnt
-        FROM {context.stg_src_table} a
+        from {context.stg_src_table}
+        where {context.start_est_dt} >=%(from_dt)s::date-%(lookup_buffer_days)s and {context.start_est_dt} <%(to_dt)s::date+%(lookup_buffer_days)s
+        group by 1,2,3,4
+        ) a
         join edw_ods.{context.ods_table_subscription_link} b on a.{context.link_id}=b.{context.link_id}
-        where a.{context.start_est_dt} >='{from_dt}'-{lookup_buffer_days} and a.{context.start_est_dt} <'{to_dt}'+{lookup_buffer_days}
-        group by 1,2,3,4,5
-        ) tmp
-        )tmp1 where rnk=1
+        group by 1,2,3,4,5;
+        """
+        
+        load_query = f"""
+        select 
+        {context.dt_subs_date_column},
+        sbscrptn_key_id,
+        cnsmd_srvc_cd,
+        cnsumd_veh_device_id,
+        sbscrptn_subtype_prdct_catg_cd
+        FROM (
+        select tmp.*,
+        row_number() over(partition by tmp.{context.dt_subs_date_column},tmp.sbscrptn_key_id,tmp.cnsmd_srvc_cd
+        order by tmp.rec_cnt desc, tmp.cnsumd_veh_device_id, tmp.sbscrptn_subtype_prdct_catg_cd) rnk
+        FROM tmp_st_device_dt_subs tmp
+        ) tmp1 where rnk=1
         """
         
-        # Execute the query
-        redshift_utils.execute_query(datamart_conn, query)
+        params = {
+            'from_dt': from_dt,
+            'to_dt': to_dt,
+            'lookup_buffer_days': int(lookup_buffer_days)
+        }
+        
+        # Build the temp tables, then replace the stage table in one transaction
+        redshift_utils.execute_query(datamart_conn, query, params)
+        row_count = redshift_utils.atomic_replace_load(
+            datamart_conn,
+            context.stg_table_dt_subs,
+            [context.dt_subs_date_column, 'sbscrptn_key_id', 'cnsmd_srvc_cd',
+             'cnsumd_veh_device_id', 'sbscrptn_subtype_prdct_catg_cd'],
+            load_query,
+            analyze=True
+        )
         
         logger.info("Successfully processed CONSUMPTION path")
+        return row_count
     except Exception as e:
         logger.error(f"Failed to process CONSUMPTION path: {str(e)}")
         raise
 
-def process_trip_path(datamart_conn, from_dt: str, to_dt: str, lookup_buffer_days: int) -> None:
+def process_trip_path(datamart_conn, from_dt: str, to_dt: str, lookup_buffer_days: int) -> int:
     """
     Process the TRIP path.
     
@@ -166,15 +202,23 @@ def process_trip_path(datamart_conn, from_dt: str, to_dt: str, lookup_buffer_day
         to_dt: End date
         lookup_buffer_days: Number of buffer days for lookup
         
+    Returns:
+        Number of rows loaded into the stage table
+        
     Raises:
         Exception: If processing fails
     """
     try:
-        # SQL query for TRIP path
+        # SQL query for TRIP path. Trips are spread over each calendar day they cover by
+        # joining a small broadcast table of day offsets (Redshift's generate_series only
+        # runs on the leader node), then the device with the most records per day, subscription and service is
+        # picked by row_number() over the daily rows; ties keep the lowest device id, then
+        # subtype, so each output row is one complete source row.
         query = f"""
         drop table if exists tmp_st_device_trip_dt_subs;
 
-        create temp table tmp_st_device_trip_dt_subs as
+        create temp table tmp_st_device_trip_dt_subs
+        distkey(sbscrptn_key_id) sortkey(trip_start_est_dt) as
         SELECT distinct 
         a.trip_start_est_ts::date as trip_start_est_dt,
         a.trip_end_est_ts::date as trip_end_est_dt,
@@ -185,93 +229,101 @@ def process_trip_path(datamart_conn, from_dt: str, to_dt: str, lookup_buffer_day
         count(1) rec_cnt
         FROM {context.stg_src_table} a
         join edw_ods.{context.ods_table_subscription_link} b on a.{context.link_id}=b.{context.link_id}
-        where a.trip_start_est_ts::date>='{from_dt}'-{lookup_buffer_days} and a.trip_start_est_ts::date <'{to_dt}'+{lookup_buffer_days}
+        where a.trip_start_est_ts >=(%(from_dt)s::date-%(lookup_buffer_days)s)::timestamp and a.trip_start_est_ts <(%(to_dt)s::date+%(lookup_buffer_days)s)::timestamp
         group by 1,2,3,4,5,6;
 
-        Truncate table {context.stg_table_dt_subs};
+        drop table if exists tmp_trip_day_offset;
 
-        Insert into {context.stg_table_dt_subs}(
-        trip_start_est_dt,
-        sbscrptn_key_id,
-        cnsmd_srvc_cd,
-        cnsumd_veh_device_id,
-        sbscrptn_subtype_prdct_catg_cd
-        )
-        select trip_start_est_dt,
-        sbscrptn_key_id,
-        cnsmd_srvc_cd,
-        cnsumd_veh_device_id,
-        sbscrptn_subtype_prdct_catg_cd  
-        from(
-        select 
-        tmp.trip_start_est_dt,
-        tmp.sbscrptn_key_id,
-        tmp.cnsmd_srvc_cd,
-        tmp.cnsumd_veh_device_id,
-        tmp.sbscrptn_subtype_prdct_catg_cd,
-        row_number() over(partition by tmp.trip_start_est_dt,tmp.sbscrptn_key_id,tmp.cnsmd_srvc_cd order by tmp.rec_cnt desc) rnk
-        from(
+        create temp table tmp_trip_day_offset diststyle all as
+        select day_nbr from(
+        select row_number() over(order by clndr_dt)-1 as day_nbr
+        from edw_datamart.dim_date
+        ) dd
+        where day_nbr <= (select max(datediff(day, trip_start_est_dt, trip_end_est_dt)) from tmp_st_device_trip_dt_subs);
+
+        drop table if exists tmp_st_device_trip_clndr_dt_subs;
+
+        create temp table tmp_st_device_trip_clndr_dt_subs
+        distkey(sbscrptn_key_id) sortkey(trip_start_est_dt) as
         SELECT distinct
-        dd.clndr_dt as trip_start_est_dt,
+        dateadd(day, o.day_nbr, a.trip_start_est_dt)::date as trip_start_est_dt,
         a.sbscrptn_key_id,
         a.cnsmd_srvc_cd,
         a.cnsumd_veh_device_id,
         a.sbscrptn_subtype_prdct_catg_cd,
         rec_cnt
         FROM tmp_st_device_trip_dt_subs a
-        join edw_datamart.dim_date dd on dd.clndr_dt between a.trip_start_est_dt and a.trip_end_est_dt
-        ) tmp
-        )tmp1 where rnk=1;
+        join tmp_trip_day_offset o on o.day_nbr <= datediff(day, a.trip_start_est_dt, a.trip_end_est_dt);
+        """
+        
+        load_query = """
+        select 
+        trip_start_est_dt,
+        sbscrptn_key_id,
+        cnsmd_srvc_cd,
+        cnsumd_veh_device_id,
+        sbscrptn_subtype_prdct_catg_cd
+        FROM (
+        select tmp.*,
+        row_number() over(partition by tmp.trip_start_est_dt,tmp.sbscrptn_key_id,tmp.cnsmd_srvc_cd
+        order by tmp.rec_cnt desc, tmp.cnsumd_veh_device_id, tmp.sbscrptn_subtype_prdct_catg_cd) rnk
+        FROM tmp_st_device_trip_clndr_dt_subs tmp
+        ) tmp1 where rnk=1
         """
         
-        # Execute the query
-        redshift_utils.execute_query(datamart_conn, query)
+        params = {
+            'from_dt': from_dt,
+            'to_dt': to_dt,
+            'lookup_buffer_days': int(lookup_buffer_days)
+        }
+        
+        # Build the temp tables, then replace the stage table in one transaction
+        redshift_utils.execute_query(datamart_conn, query, params)
+        row_count = redshift_utils.atomic_replace_load(
+            datamart_conn,
+            context.stg_table_dt_subs,
+            ['trip_start_est_dt', 'sbscrptn_key_id', 'cnsmd_srvc_cd',
+             'cnsumd_veh_device_id', 'sbscrptn_subtype_prdct_catg_cd'],
+            load_query,
+            analyze=True
+        )
         
         logger.info("Successfully processed TRIP path")
+        return row_count
     except Exception as e:
         logger.error(f"Failed to process TRIP path: {str(e)}")
         raise
 
-def process_subscription_detail(datamart_conn) -> None:
+def process_subscription_detail(datamart_conn) -> int:
     """
     Process subscription detail data.
     
     Args:
         datamart_conn: Redshift datamart connection
         
+    Returns:
+        Number of rows loaded into the detail table
+        
     Raises:
         Exception: If processing fails
     """
     try:
+        # Resolve the promo in effect on each stage date once, so the detail query can
+        # join it on (promo code, date) instead of a range join per stage row
+        promo_query = f"""
+        drop table if exists tmp_st_promo_dt;
+
+        create temp table tmp_st_promo_dt as
+        select
+        c.strmng_promo_key_id,
+        c.strmng_promo_cd,
+        d.{context.dt_subs_date_column}
+        from (select distinct {context.dt_subs_date_column} from {context.stg_table_dt_subs}) d
+        join edw_datamart.DIM_STREAMING_PROMO c on d.{context.dt_subs_date_column} between c.rec_eff_ts and c.rec_exp_ts;
+        """
+        
         # SQL query for subscription detail
         query = f"""
-        truncate table {context.stg_table_dt_subs_dtl};
-
-        Insert into {context.stg_table_dt_subs_dtl}(
-        {context.dt_subs_date_column},
-        sbscrptn_key_id,
-        cnsmd_srvc_cd,
-        sbscrptn_id,
-        short_sbscrptn_id,
-        sbscrbr_id,
-        audio_srvc_id,
-        strmng_srvc_id,
-        srvc_subtype_cd,
-        srvc_type_cd,
-        trial_start_est_dt,
-        trial_end_est_dt,
-        trial_actvtn_est_dt,
-        trial_durn_cd,
-        sbscrptn_start_dt,
-        sbscrptn_end_dt,
-        strmng_promo_key_id,
-        strmng_promo_cd,
-        strmng_rgstrtn_zip_cd,
-        cnsumd_veh_device_id,
-        sbscrptn_device_id,
-        create_ts,
-        sbscrptn_subtype_prdct_catg_cd
-        )
         select
         a.{context.dt_subs_date_column},
         a.sbscrptn_key_id,
@@ -308,49 +360,47 @@ def process_subscription_detail(datamart_conn) -> None:
         from
         {context.stg_table_dt_subs} a
         left outer join edw_datamart.dim_subscription b on b.sbscrptn_key_id=a.sbscrptn_key_id
-        left outer join edw_datamart.DIM_STREAMING_PROMO c on c.strmng_promo_cd=b.strmng_promo_cd and a.{context.dt_subs_date_column} between c.rec_eff_ts and c.rec_exp_ts
+        left outer join tmp_st_promo_dt c on c.strmng_promo_cd=b.strmng_promo_cd and c.{context.dt_subs_date_column}=a.{context.dt_subs_date_column}
         left outer join edw_ods.v_service_subtype AUDSRVC ON (CASE WHEN a.cnsmd_srvc_cd = 'Audio' THEN b.curr_audio_srvc_subtype_cd ELSE 'N/A' END) = AUDSRVC.srvc_subtype_cd
-        LEFT OUTER JOIN edw_ods.v_service_subtype STRSRVC ON (CASE WHEN a.cnsmd_srvc_cd = 'SIR' THEN b.curr_strmng_srvc_subtype_cd ELSE 'N/A' END) = STRSRVC.srvc_subtype_cd;
+        LEFT OUTER JOIN edw_ods.v_service_subtype STRSRVC ON (CASE WHEN a.cnsmd_srvc_cd = 'SIR' THEN b.curr_strmng_srvc_subtype_cd ELSE 'N/A' END) = STRSRVC.srvc_subtype_cd
         """
         
-        # Execute the query
-        redshift_utils.execute_query(datamart_conn, query)
+        columns = [
+            context.dt_subs_date_column,
+            'sbscrptn_key_id',
+            'cnsmd_srvc_cd',
+            'sbscrptn_id',
+            'short_sbscrptn_id',
+            'sbscrbr_id',
+            'audio_srvc_id',
+            'strmng_srvc_id',
+            'srvc_subtype_cd',
+            'srvc_type_cd',
+            'trial_start_est_dt',
+            'trial_end_est_dt',
+            'trial_actvtn_est_dt',
+            'trial_durn_cd',
+            'sbscrptn_start_dt',
+            'sbscrptn_end_dt',
+            'strmng_promo_key_id',
+            'strmng_promo_cd',
+            'strmng_rgstrtn_zip_cd',
+            'cnsumd_veh_device_id',
+            'sbscrptn_device_id',
+            'create_ts',
+            'sbscrptn_subtype_prdct_catg_cd'
+        ]
+        
+        # Build the promo lookup, then replace the detail table in one transaction
+        redshift_utils.execute_query(datamart_conn, promo_query)
+        row_count = redshift_utils.atomic_replace_load(datamart_conn, context.stg_table_dt_subs_dtl, columns, query)
         
         logger.info("Successfully processed subscription detail data")
+        return row_count
     except Exception as e:
         logger.error(f"Failed to process subscription detail data: {str(e)}")
         raise
 
-def count_records(datamart_conn) -> Tuple[int, int]:
-    """
-    Count records in source and target tables.
-    
-    Args:
-        datamart_conn: Redshift datamart connection
-        
-    Returns:
-        Tuple of (source_count, target_count)
-        
-    Raises:
-        Exception: If record counting fails
-    """
-    try:
-        # Count source records
-        source_query = f"select count(*) from {context.stg_table_dt_subs};"
-        source_result = redshift_utils.fetch_one(datamart_conn, source_query)
-        source_count = source_result[0] if source_result else 0
-        
-        # Count target records
-        target_query = f"select count(*) from {context.stg_table_dt_subs_dtl};"
-        target_result = redshift_utils.fetch_one(datamart_conn, target_query)
-        target_count = target_result[0] if target_result else 0
-        
-        logger.info(f"Record counts - Source: {source_count}, Target: {target_count}")
-        return source_count, target_count
-    except Exception as e:
-        logger.error(f"Failed to count records: {str(e)}")
-        raise
-
 def run_main_job(pre_job_results: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
     """
     Run main job tasks for the Job_EDW_ST_CNSMPTN_CMN_DIM_US_STG_TO_SUBS_DTL job.
@@ -388,16 +438,16 @@ def run_main_job(pre_job_results: Dict[str, Any], config: Dict[str, Any]) -> Dic
         # Process based on flow path
         if context.flow_path == "TRIP":
             # TRIP processing path
-            process_trip_path(datamart_conn, from_dt, to_dt, context.lookup_buffer_days)
+            source_count = process_trip_path(datamart_conn, from_dt, to_dt, context.lookup_buffer_days)
         else:
             # CONSUMPTION processing path (default)
-            process_consumption_path(datamart_conn, from_dt, to_dt, context.lookup_buffer_days)
+            source_count = process_consumption_path(datamart_conn, from_dt, to_dt, context.lookup_buffer_days)
         
         # Process subscription detail
-        process_subscription_detail(datamart_conn)
+        target_count = process_subscription_detail(datamart_conn)
         
-        # Count records
-        source_count, target_count = count_records(datamart_conn)
+        # Record counts come from the loads themselves rather than re-counting the tables
+        logger.info(f"Record counts - Source: {source_count}, Target: {target_count}")
         
         # Set record counts in context
         context.SRC_REC_QTY = source_count
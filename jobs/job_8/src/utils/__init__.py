@@ -1,15 +1,30 @@
 """
 Utility modules for AWS Glue Python Shell jobs.
 """
+import importlib
 
-# Import modules to make them available when importing the package
-import src.utils.s3_utils
-import src.utils.logging_utils
-import src.utils.argument_utils
-import src.utils.ssm_utils
-import src.utils.redshift_utils
-import src.utils.aurora_utils
-import src.utils.teradata_utils
+# Modules are imported on first access (PEP 562) rather than with the package, so a job
+# only pays for boto3 and the database drivers it actually uses
+_LAZY = {
+    'aws_clients': 'src.utils.aws_clients',
+    's3_utils': 'src.utils.s3_utils',
+    'logging_utils': 'src.utils.logging_utils',
+    'argument_utils': 'src.utils.argument_utils',
+    'ssm_utils': 'src.utils.ssm_utils',
+    'redshift_utils': 'src.utils.redshift_utils',
+    'aurora_utils': 'src.utils.aurora_utils',
+    'teradata_utils': 'src.utils.teradata_utils',
+}
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY[name])
+    globals()[name] = module
+    return module
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
 
 # This allows users to import modules like:
-# from src.utils import s3_utils, logging_utils, argument_utils, ssm_utils, redshift_utils, aurora_utils, teradata_utils
+# from src.utils import aws_clients, s3_utils, logging_utils, argument_utils, ssm_utils, redshift_utils, aurora_utils, teradata_utils
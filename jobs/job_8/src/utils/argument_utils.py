@@ -2,8 +2,17 @@
 Argument parsing utility functions for AWS Glue Python Shell jobs.
 """
 import argparse
+import functools
+import sys
 from typing import Dict, Any, List, Optional, Union
 
+# Arguments every standard Glue Python Shell job accepts
+_DEFAULT_REQUIRED_PARAMS = ['JOB_NAME']
+_DEFAULT_OPTIONAL_PARAMS = {
+    'log_level': 'INFO',
+    'region': None,
+}
+
 def get_job_arguments(
     required_args: Optional[List[str]] = None,
     optional_args: Optional[Dict[str, Any]] = None,
@@ -20,6 +29,28 @@ def get_job_arguments(
     Returns:
         Namespace containing the parsed arguments
     """
+    parser = _build_parser(required_args, optional_args, description)
+    
+    # Parse known args to handle AWS Glue's additional arguments
+    args, _ = parser.parse_known_args()
+    return args
+
+def _build_parser(
+    required_args: Optional[List[str]],
+    optional_args: Optional[Dict[str, Any]],
+    description: str
+) -> argparse.ArgumentParser:
+    """
+    Build an argument parser for the given required and optional arguments.
+    
+    Args:
+        required_args: List of required argument names
+        optional_args: Dictionary of optional arguments with default values
+        description: Job description for help text
+        
+    Returns:
+        Configured ArgumentParser
+    """
     parser = argparse.ArgumentParser(description=description)
     
     # Add required arguments
@@ -45,9 +76,17 @@ def get_job_arguments(
                 help=help_text
             )
     
-    # Parse known args to handle AWS Glue's additional arguments
-    args, _ = parser.parse_known_args()
-    return args
+    return parser
+
+@functools.lru_cache(maxsize=1)
+def _default_parser() -> argparse.ArgumentParser:
+    """
+    Build the parser for the default job arguments once, on first use.
+    
+    Returns:
+        ArgumentParser for the default job arguments
+    """
+    return _build_parser(_DEFAULT_REQUIRED_PARAMS, _DEFAULT_OPTIONAL_PARAMS, "AWS Glue Python Shell Job")
 
 def get_job_params(
     required_params: Optional[List[str]] = None,
@@ -111,34 +150,75 @@ def s3_path_validator(path: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    if not isinstance(path, str):
-        return False
+    # The bucket name is non-empty when something follows 's3://' and it is not a '/'
+    return (
+        isinstance(path, str)
+        and path.startswith('s3://')
+        and len(path) > 5
+        and path.find('/', 5) != 5
+    )
+
+def _parse_known(
+    argv: List[str],
+    required: List[str],
+    optionals: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Pick known --name value / --name=value flags out of argv in a single pass.
     
-    if not path.startswith('s3://'):
-        return False
+    Unknown flags are ignored, as with parse_known_args.
     
-    parts = path[5:].split('/', 1)
-    if len(parts) < 1 or not parts[0]:
-        return False
+    Args:
+        argv: Command line arguments, without the program name
+        required: List of required argument names
+        optionals: Dictionary of optional arguments with default values
+        
+    Returns:
+        Dictionary of parsed arguments, or None if a required argument is missing
+    """
+    known = set(required) | set(optionals)
+    params = dict.fromkeys(required)
+    params.update(optionals)
     
-    return True
+    i, n = 0, len(argv)
+    while i < n:
+        arg = argv[i]
+        i += 1
+        if not arg.startswith('--'):
+            continue
+        name, sep, value = arg[2:].partition('=')
+        if name not in known:
+            continue
+        if not sep:
+            if i >= n:
+                return None
+            value = argv[i]
+            i += 1
+        params[name] = value
+    
+    if any(params[name] is None for name in required):
+        return None
+    return params
 
-def get_default_job_params() -> Dict[str, Any]:
+def get_default_job_params(strict: bool = False) -> Dict[str, Any]:
     """
     Get default job parameters for a standard Glue Python Shell job.
     
+    The arguments are read with a direct scan of sys.argv, since their shape is fixed.
+    argparse is only built when strict is set or a required argument is missing, so its
+    usage error is still what gets reported.
+    
+    Args:
+        strict: Always parse with argparse (default: False)
+        
     Returns:
         Dictionary of parsed parameters
     """
-    required_params = ['JOB_NAME']
-    
-    optional_params = {
-        'log_level': 'INFO',
-        'region': None,
-    }
+    if not strict:
+        params = _parse_known(sys.argv[1:], _DEFAULT_REQUIRED_PARAMS, _DEFAULT_OPTIONAL_PARAMS)
+        if params is not None:
+            return params
     
-    return get_job_params(
-        required_params=required_params,
-        optional_params=optional_params,
-        description="AWS Glue Python Shell Job"
-    )
+    # The parser is shared between calls, so only parse here and never add arguments
+    args, _ = _default_parser().parse_known_args()
+    return vars(args)
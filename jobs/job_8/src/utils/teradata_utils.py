@@ -1,13 +1,64 @@
 """
 Teradata database utility functions for AWS Glue Python Shell jobs.
 """
+import atexit
+import concurrent.futures
+import functools
+import itertools
 import logging
-from typing import Dict, Any, List, Optional, Union, Tuple
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union, Tuple
 import pandas as pd
-import json
+
+# orjson decodes secrets faster when it is installed; stdlib json is the fallback
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
 logger = logging.getLogger(__name__)
 
+# Idle connections kept in module scope so repeated calls in a warm Glue container skip
+# the Teradata logon, keyed by (host, user, database); each queue holds
+# (connection, released_at) pairs
+_POOLS: Dict[Tuple[str, str, Optional[str]], queue.Queue] = {}
+_POOLS_LOCK = threading.Lock()
+
+# Pool key of each checked-out connection, keyed by id(conn)
+_CONN_POOL_KEYS: Dict[int, Tuple[str, str, Optional[str]]] = {}
+
+# Maximum idle connections kept per pool, and seconds before an idle connection is closed
+MAX_POOL_SIZE = 25
+POOL_IDLE_TIMEOUT = 300
+
+# Rows requested per fetch round trip; teradatasql sizes its fetchmany/fetchall prefetch
+# from cursor.arraysize, whose DB-API default is a single row
+FETCH_ARRAYSIZE = 10000
+
+# Batch loops in execute_fastload / execute_fastexport log progress once per this many batches
+LOG_EVERY_N_BATCHES = 100
+
+# Cursors kept open for callers that pass reuse_cursor=True, keyed by id(conn)
+_CACHED_CURSORS: Dict[int, Tuple['teradatasql.TeradataConnection', 'teradatasql.TeradataCursor']] = {}
+
+# Statements that only read, so there is no transaction to commit or roll back
+# (SEL is Teradata's abbreviation for SELECT)
+_is_read_only = re.compile(r'^\s*(select|sel|help|show|explain)\b', re.I).match
+
+# Plain SELECT statements, the only ones fetch_one can wrap in a TOP n derived table
+_is_select = re.compile(r'^\s*(select|sel)\b', re.I).match
+
+# teradatasql escape functions that route an INSERT batch through the FastLoad protocol
+# and a SELECT through the FastExport protocol (each falling back to regular SQL when
+# the native protocol cannot be used)
+FASTLOAD_ESCAPE = "{fn teradata_try_fastload}"
+FASTEXPORT_ESCAPE = "{fn teradata_try_fastexport}"
+NATIVESQL_ESCAPE = "{fn teradata_nativesql}"
+
 # Check if teradatasql is available
 try:
     import teradatasql
@@ -66,6 +117,177 @@ def get_teradata_connection(
         logger.error(f"Error connecting to Teradata database: {str(e)}")
         raise
 
+@contextmanager
+def _with_cursor(
+    conn: 'teradatasql.TeradataConnection',
+    reuse_cursor: bool = False
+) -> Iterator['teradatasql.TeradataCursor']:
+    """
+    Yield a cursor for the connection.
+    
+    By default a new cursor is opened and closed around each call. With reuse_cursor=True
+    one cursor per connection is kept open and shared by later calls that also ask for it.
+    
+    Args:
+        conn: teradatasql connection
+        reuse_cursor: Whether to use the connection's cached cursor (default: False)
+        
+    Yields:
+        teradatasql cursor
+    """
+    if not reuse_cursor:
+        cursor = conn.cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+        return
+    
+    cached = _CACHED_CURSORS.get(id(conn))
+    if cached is None or cached[0] is not conn:
+        cached = (conn, conn.cursor())
+        _CACHED_CURSORS[id(conn)] = cached
+    yield cached[1]
+
+def _close_cached_cursor(conn: 'teradatasql.TeradataConnection') -> None:
+    """
+    Close the cursor cached for a connection by reuse_cursor=True, if any.
+    
+    Args:
+        conn: teradatasql connection
+    """
+    cached = _CACHED_CURSORS.pop(id(conn), None)
+    if cached is not None and cached[0] is conn:
+        try:
+            cached[1].close()
+        except Exception as e:
+            logger.warning(f"Error closing cached Teradata cursor: {str(e)}")
+
+def get_pooled_connection(
+    host: str,
+    username: str,
+    password: str,
+    database: Optional[str] = None,
+    **kwargs
+) -> 'teradatasql.TeradataConnection':
+    """
+    Get a Teradata connection from the module pool, opening a new one if none is idle.
+    
+    Idle connections older than POOL_IDLE_TIMEOUT seconds are closed instead of reused.
+    Hand the connection back with release_connection.
+    
+    Args:
+        host: Teradata host
+        username: Teradata username
+        password: Teradata password
+        database: Teradata database name (optional)
+        **kwargs: Additional connection parameters (only used for new connections)
+        
+    Returns:
+        teradatasql connection
+        
+    Raises:
+        ImportError: If teradatasql is not installed
+        Exception: If the connection cannot be established
+    """
+    pool_key = (host, username, database)
+    with _POOLS_LOCK:
+        pool = _POOLS.setdefault(pool_key, queue.Queue(maxsize=MAX_POOL_SIZE))
+    
+    while True:
+        try:
+            conn, released_at = pool.get_nowait()
+        except queue.Empty:
+            conn = get_teradata_connection(host, username, password, database, **kwargs)
+            break
+        
+        if time.monotonic() - released_at < POOL_IDLE_TIMEOUT:
+            logger.info(f"Reusing pooled Teradata connection to {host}")
+            break
+        
+        try:
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Error closing idle Teradata connection: {str(e)}")
+    
+    _CONN_POOL_KEYS[id(conn)] = pool_key
+    return conn
+
+def release_connection(conn: 'teradatasql.TeradataConnection') -> None:
+    """
+    Return a connection to the pool it was taken from.
+    
+    Connections that did not come from a pool, or that do not fit in a full pool,
+    are closed instead.
+    
+    Args:
+        conn: teradatasql connection
+    """
+    _close_cached_cursor(conn)
+    
+    pool_key = _CONN_POOL_KEYS.pop(id(conn), None)
+    pool = _POOLS.get(pool_key) if pool_key else None
+    
+    if pool is not None:
+        try:
+            pool.put_nowait((conn, time.monotonic()))
+            logger.info("Returned Teradata connection to pool")
+            return
+        except queue.Full:
+            pass
+    
+    conn.close()
+
+@contextmanager
+def pooled_connection(
+    host: str,
+    username: str,
+    password: str,
+    database: Optional[str] = None,
+    **kwargs
+) -> Iterator['teradatasql.TeradataConnection']:
+    """
+    Context manager that checks a connection out of the pool and returns it on exit.
+    
+    Args:
+        host: Teradata host
+        username: Teradata username
+        password: Teradata password
+        database: Teradata database name (optional)
+        **kwargs: Additional connection parameters
+        
+    Yields:
+        teradatasql connection
+    """
+    conn = get_pooled_connection(host, username, password, database, **kwargs)
+    try:
+        yield conn
+    finally:
+        release_connection(conn)
+
+def close_all_connections() -> None:
+    """
+    Close every idle pooled Teradata connection.
+    """
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    
+    for pool in pools:
+        while True:
+            try:
+                conn, _ = pool.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.close()
+            except Exception as e:
+                logger.warning(f"Error closing pooled Teradata connection: {str(e)}")
+    _CONN_POOL_KEYS.clear()
+    _CACHED_CURSORS.clear()
+
+atexit.register(close_all_connections)
+
 def get_teradata_connection_from_secret(
     secret_name: str,
     region_name: Optional[str] = None
@@ -95,7 +317,7 @@ def get_teradata_connection_from_secret(
         secret_value = get_parameter(secret_name, True, region_name)
         
         # Parse the secret
-        secret = json.loads(secret_value)
+        secret = _json.loads(secret_value)
         
         # Get the connection
         return get_teradata_connection(
@@ -112,16 +334,20 @@ def execute_query(
     conn: 'teradatasql.TeradataConnection',
     query: str,
     params: Optional[Union[Tuple, Dict[str, Any], List]] = None,
-    commit: bool = True
+    commit: bool = True,
+    reuse_cursor: bool = False
 ) -> int:
     """
     Execute a query on a Teradata database.
     
+    Read-only statements (SELECT, HELP, SHOW, EXPLAIN) are never committed or rolled back.
+    
     Args:
         conn: teradatasql connection
         query: SQL query
         params: Query parameters (optional)
         commit: Whether to commit the transaction (default: True)
+        reuse_cursor: Whether to use the connection's cached cursor (default: False)
         
     Returns:
         Number of rows affected
@@ -129,15 +355,15 @@ def execute_query(
     Raises:
         Exception: If the query cannot be executed
     """
+    commit = commit and not _is_read_only(query)
     try:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        
-        if commit:
-            conn.commit()
+        with _with_cursor(conn, reuse_cursor) as cursor:
+            cursor.execute(query, params)
             
-        row_count = cursor.rowcount
-        cursor.close()
+            if commit:
+                conn.commit()
+                
+            row_count = cursor.rowcount
         
         logger.info(f"Successfully executed query, {row_count} rows affected")
         return row_count
@@ -150,7 +376,8 @@ def execute_query(
 def fetch_all(
     conn: 'teradatasql.TeradataConnection',
     query: str,
-    params: Optional[Union[Tuple, Dict[str, Any], List]] = None
+    params: Optional[Union[Tuple, Dict[str, Any], List]] = None,
+    reuse_cursor: bool = False
 ) -> List[Tuple]:
     """
     Fetch all rows from a query on a Teradata database.
@@ -159,6 +386,7 @@ def fetch_all(
         conn: teradatasql connection
         query: SQL query
         params: Query parameters (optional)
+        reuse_cursor: Whether to use the connection's cached cursor (default: False)
         
     Returns:
         List of rows
@@ -167,11 +395,10 @@ def fetch_all(
         Exception: If the query cannot be executed
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        
-        rows = cursor.fetchall()
-        cursor.close()
+        with _with_cursor(conn, reuse_cursor) as cursor:
+            cursor.arraysize = FETCH_ARRAYSIZE
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
         
         logger.info(f"Successfully fetched {len(rows)} rows")
         return rows
@@ -182,15 +409,24 @@ def fetch_all(
 def fetch_one(
     conn: 'teradatasql.TeradataConnection',
     query: str,
-    params: Optional[Union[Tuple, Dict[str, Any], List]] = None
+    params: Optional[Union[Tuple, Dict[str, Any], List]] = None,
+    reuse_cursor: bool = False,
+    limit: Optional[int] = None
 ) -> Optional[Tuple]:
     """
     Fetch one row from a query on a Teradata database.
     
+    With limit set, a SELECT is wrapped as ``SELECT TOP <limit> * FROM (<query>) sub_q`` so
+    the server stops after that many rows instead of building the full result. Teradata
+    does not allow ORDER BY in a derived table, so only use it for unordered lookups.
+    Statements other than SELECT are run unchanged.
+    
     Args:
         conn: teradatasql connection
         query: SQL query
         params: Query parameters (optional)
+        reuse_cursor: Whether to use the connection's cached cursor (default: False)
+        limit: Number of rows the server returns for a SELECT (optional)
         
     Returns:
         Row or None if no rows are returned
@@ -198,12 +434,13 @@ def fetch_one(
     Raises:
         Exception: If the query cannot be executed
     """
+    if limit is not None and _is_select(query):
+        query = f"SELECT TOP {int(limit)} * FROM ({query.strip().rstrip(';')}) sub_q"
+    
     try:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        
-        row = cursor.fetchone()
-        cursor.close()
+        with _with_cursor(conn, reuse_cursor) as cursor:
+            cursor.execute(query, params)
+            row = cursor.fetchone()
         
         if row:
             logger.info("Successfully fetched one row")
@@ -218,15 +455,20 @@ def fetch_one(
 def fetch_as_dataframe(
     conn: 'teradatasql.TeradataConnection',
     query: str,
-    params: Optional[Union[Tuple, Dict[str, Any], List]] = None
+    params: Optional[Union[Tuple, Dict[str, Any], List]] = None,
+    batch_size: int = 10000
 ) -> pd.DataFrame:
     """
     Fetch query results as a pandas DataFrame.
     
+    Rows are fetched in batches and appended to one buffer per column, and the DataFrame
+    is built from those columns instead of going through pandas' SQL layer.
+    
     Args:
         conn: teradatasql connection
         query: SQL query
         params: Query parameters (optional)
+        batch_size: Number of rows to fetch in each batch (default: 10000)
         
     Returns:
         pandas DataFrame
@@ -235,8 +477,24 @@ def fetch_as_dataframe(
         Exception: If the query cannot be executed
     """
     try:
-        # Use pandas to execute the query and return a DataFrame
-        df = pd.read_sql(query, conn, params=params)
+        cursor = conn.cursor()
+        cursor.arraysize = max(batch_size, FETCH_ARRAYSIZE)
+        cursor.execute(query, params)
+        
+        column_names = [desc[0] for desc in cursor.description]
+        columns = [[] for _ in column_names]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for buffer, values in zip(columns, zip(*rows)):
+                buffer.extend(values)
+        
+        cursor.close()
+        
+        # Key the buffers by position so duplicate column names each keep their own values
+        df = pd.DataFrame(dict(enumerate(columns)))
+        df.columns = column_names
         
         logger.info(f"Successfully fetched {len(df)} rows as DataFrame")
         return df
@@ -283,17 +541,164 @@ def execute_batch(
             conn.rollback()
         raise
 
+def _executemany_isolating(
+    cursor: 'teradatasql.TeradataCursor',
+    query: str,
+    rows: List[Union[Tuple, List]],
+    rejected_rows: List[Tuple[Any, str]]
+) -> int:
+    """
+    Run executemany, splitting a failing chunk in halves until the bad rows are isolated.
+    
+    Args:
+        cursor: teradatasql cursor
+        query: SQL statement with ? placeholders
+        rows: Parameter rows
+        rejected_rows: List the (row, error message) pairs of failing rows are appended to
+        
+    Returns:
+        Number of rows executed successfully
+    """
+    try:
+        cursor.executemany(query, rows)
+        return len(rows)
+    except Exception as e:
+        if len(rows) == 1:
+            rejected_rows.append((rows[0], str(e)))
+            return 0
+    
+    middle = len(rows) // 2
+    return (
+        _executemany_isolating(cursor, query, rows[:middle], rejected_rows)
+        + _executemany_isolating(cursor, query, rows[middle:], rejected_rows)
+    )
+
+def execute_many(
+    conn: 'teradatasql.TeradataConnection',
+    query: str,
+    params_iter: Iterable[Union[Tuple, List]],
+    chunk_size: int = 10000,
+    commit_every: int = 0,
+    rejected_rows: Optional[List[Tuple[Any, str]]] = None
+) -> int:
+    """
+    Execute a statement for every parameter row, streaming the rows in chunks.
+    
+    One cursor is used for the whole run and each chunk is sent with executemany, so the
+    statement is prepared once rather than per row. When rejected_rows is given, a failing
+    chunk is split in halves down to single rows; the failing rows and their errors are
+    appended to rejected_rows and the rest are still executed. This relies on a failed
+    request only rolling back itself, which holds with autocommit on (the teradatasql
+    default).
+    
+    Args:
+        conn: teradatasql connection
+        query: SQL statement with ? placeholders
+        params_iter: Iterable of parameter rows
+        chunk_size: Number of rows sent per executemany call (default: 10000)
+        commit_every: Commit after this many chunks; 0 commits once at the end (default: 0)
+        rejected_rows: List to collect (row, error message) pairs instead of raising (optional)
+        
+    Returns:
+        Number of rows executed successfully
+        
+    Raises:
+        Exception: If a chunk fails and rejected_rows is not given
+    """
+    rows = iter(params_iter)
+    total_rows = 0
+    try:
+        with _with_cursor(conn) as cursor:
+            for chunk_number in itertools.count(1):
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+                
+                if rejected_rows is None:
+                    cursor.executemany(query, chunk)
+                    total_rows += len(chunk)
+                else:
+                    total_rows += _executemany_isolating(cursor, query, chunk, rejected_rows)
+                
+                if commit_every and chunk_number % commit_every == 0:
+                    conn.commit()
+            
+            conn.commit()
+        
+        if rejected_rows:
+            logger.warning(f"Rejected {len(rejected_rows)} rows while executing statement")
+        logger.info(f"Successfully executed statement for {total_rows} rows")
+        return total_rows
+    except Exception as e:
+        logger.error(f"Error executing statement for many rows: {str(e)}")
+        conn.rollback()
+        raise
+
+def _check_fastload_errors(cursor: 'teradatasql.TeradataCursor', insert_stmt: str) -> None:
+    """
+    Raise if the driver reported FastLoad errors for an INSERT, and log its warnings.
+    
+    FastLoad errors are not raised by executemany; they have to be queried explicitly.
+    The warnings also tell whether FastLoad was used or the driver fell back to SQL inserts.
+    
+    Args:
+        cursor: teradatasql cursor the INSERT was executed on
+        insert_stmt: The INSERT statement, including the FastLoad escape
+        
+    Raises:
+        RuntimeError: If FastLoad reported errors
+    """
+    cursor.execute(f"{NATIVESQL_ESCAPE}{{fn teradata_get_errors}}{insert_stmt}")
+    errors = [row[0] for row in cursor.fetchall()]
+    if errors:
+        raise RuntimeError(f"FastLoad reported errors: {'; '.join(errors)}")
+    
+    cursor.execute(f"{NATIVESQL_ESCAPE}{{fn teradata_get_warnings}}{insert_stmt}")
+    for row in cursor.fetchall():
+        logger.warning(f"FastLoad warning: {row[0]}")
+
+@functools.lru_cache(maxsize=64)
+def _build_insert(table_name: str, columns: Tuple[str, ...]) -> str:
+    """
+    Build the FastLoad INSERT statement for a table and column list.
+    
+    Args:
+        table_name: Teradata table name
+        columns: Column names
+        
+    Returns:
+        INSERT statement with the FastLoad escape and one ? placeholder per column
+    """
+    placeholders = ', '.join(['?'] * len(columns))
+    column_names = ', '.join(columns)
+    return f"{FASTLOAD_ESCAPE}INSERT INTO {table_name} ({column_names}) VALUES ({placeholders})"
+
 def execute_fastload(
     conn: 'teradatasql.TeradataConnection',
     table_name: str,
     data: Union[List[Tuple], pd.DataFrame],
     columns: Optional[List[str]] = None,
     batch_size: int = 10000,
-    commit: bool = True
+    commit: bool = True,
+    commit_every_batches: int = 0
 ) -> int:
     """
     Fast load data into a Teradata table.
     
+    The INSERT is sent with the teradatasql FastLoad escape, so the driver uses Teradata's
+    native FastLoad protocol when the target table allows it (e.g. an empty table) and
+    falls back to regular batched inserts otherwise. Either way each batch is bound as one
+    parameter array and sent as a single request (Teradata SQL has no multi-row VALUES
+    syntax to pack rows into). FastLoad needs autocommit off, so it is turned off for the
+    load; with commit=True it is turned back on afterwards, otherwise the caller owns the
+    open transaction.
+    
+    With commit=True and commit_every_batches set, the load is also committed every that
+    many batches, which keeps the transient journal small and limits what a late failure
+    rolls back, at the cost of more commits. A FastLoad job ends at its first commit and
+    the table is then no longer empty, so the remaining batches fall back to regular
+    inserts; leave it at 0 when loading an empty table through FastLoad.
+    
     Args:
         conn: teradatasql connection
         table_name: Teradata table name
@@ -301,6 +706,7 @@ def execute_fastload(
         columns: Column names (optional, required if data is a list of tuples)
         batch_size: Number of rows to insert in each batch (default: 10000)
         commit: Whether to commit the transaction (default: True)
+        commit_every_batches: Commit after this many batches; 0 commits once at the end (default: 0)
         
     Returns:
         Number of rows loaded
@@ -310,42 +716,125 @@ def execute_fastload(
         Exception: If the data cannot be loaded
     """
     try:
-        # Convert DataFrame to list of tuples if needed
+        # Stream DataFrame rows as plain tuples (itertuples keeps each column's own type,
+        # where .values would upcast mixed frames to object) instead of copying them all
         if isinstance(data, pd.DataFrame):
             if columns is None:
                 columns = data.columns.tolist()
-            data = [tuple(row) for row in data.values]
+            rows = data.itertuples(index=False, name=None)
         elif columns is None:
             raise ValueError("columns must be provided if data is a list of tuples")
+        else:
+            rows = iter(data)
         
-        # Build the INSERT statement
-        placeholders = ', '.join(['?'] * len(columns))
-        column_names = ', '.join(columns)
-        insert_stmt = f"INSERT INTO {table_name} ({column_names}) VALUES ({placeholders})"
+        # Build the INSERT statement (cached per table and column list)
+        insert_stmt = _build_insert(table_name, tuple(columns))
         
         # Execute in batches
         cursor = conn.cursor()
         total_rows = 0
         
-        for i in range(0, len(data), batch_size):
-            batch = data[i:i+batch_size]
-            cursor.executemany(insert_stmt, batch)
-            total_rows += len(batch)
-            logger.info(f"Loaded batch {i//batch_size + 1}, {len(batch)} rows")
-        
-        if commit:
-            conn.commit()
+        cursor.execute(f"{NATIVESQL_ESCAPE}{{fn teradata_autocommit_off}}")
+        try:
+            for batch_number in itertools.count(1):
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch:
+                    break
+                cursor.executemany(insert_stmt, batch)
+                total_rows += len(batch)
+                if batch_number % LOG_EVERY_N_BATCHES == 0:
+                    logger.info("Loaded batch %d, %d rows so far", batch_number, total_rows)
+                
+                if commit and commit_every_batches and batch_number % commit_every_batches == 0:
+                    _check_fastload_errors(cursor, insert_stmt)
+                    conn.commit()
+                    _check_fastload_errors(cursor, insert_stmt)
             
-        cursor.close()
+            _check_fastload_errors(cursor, insert_stmt)
+            
+            if commit:
+                conn.commit()
+                # Errors raised while FastLoad applies the rows are reported after the commit
+                _check_fastload_errors(cursor, insert_stmt)
+        except Exception:
+            if commit:
+                conn.rollback()
+            raise
+        finally:
+            # Without commit the caller owns the open transaction, so leave autocommit off
+            if commit:
+                cursor.execute(f"{NATIVESQL_ESCAPE}{{fn teradata_autocommit_on}}")
+            cursor.close()
         
         logger.info(f"Successfully loaded {total_rows} rows into {table_name}")
         return total_rows
     except Exception as e:
         logger.error(f"Error loading data: {str(e)}")
-        if commit:
-            conn.rollback()
         raise
 
+def _iter_prefetched_batches(
+    cursor: 'teradatasql.TeradataCursor',
+    batch_size: int,
+    prefetch: int = 4
+) -> Iterator[List[Tuple]]:
+    """
+    Yield fetchmany batches while a background thread fetches the next ones.
+    
+    Only the background thread touches the cursor until the result is exhausted, so the
+    driver can receive the next batch while the caller is still processing the last one.
+    
+    Args:
+        cursor: teradatasql cursor with an executed query
+        batch_size: Number of rows per batch
+        prefetch: Maximum number of batches buffered ahead of the caller (default: 4)
+        
+    Yields:
+        Lists of rows
+        
+    Raises:
+        Exception: If fetching fails in the background thread
+    """
+    batches = queue.Queue(maxsize=prefetch)
+    # Set when the caller stops early, so the producer gives up instead of blocking
+    # on a full queue that nothing drains any more
+    stop = threading.Event()
+    
+    def put(item: Optional[List]) -> bool:
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce() -> None:
+        try:
+            while not stop.is_set():
+                rows = cursor.fetchmany(batch_size)
+                if not rows or not put(rows):
+                    break
+        finally:
+            # Always unblock the consumer, even when fetching fails
+            put(None)
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(produce)
+        try:
+            while True:
+                rows = batches.get()
+                if rows is None:
+                    break
+                yield rows
+            future.result()
+        finally:
+            stop.set()
+            while True:
+                try:
+                    batches.get_nowait()
+                except queue.Empty:
+                    break
+
 def execute_fastexport(
     conn: 'teradatasql.TeradataConnection',
     query: str,
@@ -355,6 +844,11 @@ def execute_fastexport(
     """
     Fast export data from a Teradata query to a pandas DataFrame.
     
+    The query is sent with the teradatasql FastExport escape so the driver streams the
+    result over Teradata's native FastExport protocol when possible. The number of
+    FastExport data sessions is set with the ``sessions`` connection parameter
+    (e.g. ``get_teradata_connection(..., sessions=4)``).
+    
     Args:
         conn: teradatasql connection
         query: SQL query
@@ -369,24 +863,28 @@ def execute_fastexport(
     """
     try:
         cursor = conn.cursor()
-        cursor.execute(query, params)
+        cursor.arraysize = max(batch_size, FETCH_ARRAYSIZE)
+        cursor.execute(f"{FASTEXPORT_ESCAPE}{query}", params)
         
         # Get column names
         column_names = [desc[0] for desc in cursor.description]
         
-        # Fetch data in batches
-        all_data = []
-        while True:
-            rows = cursor.fetchmany(batch_size)
-            if not rows:
-                break
-            all_data.extend(rows)
-            logger.info(f"Fetched {len(all_data)} rows so far")
+        # Fetch data in batches straight into one buffer per column
+        columns = [[] for _ in column_names]
+        total_rows = 0
+        for batch_number, rows in enumerate(_iter_prefetched_batches(cursor, batch_size), 1):
+            for buffer, values in zip(columns, zip(*rows)):
+                buffer.extend(values)
+            total_rows += len(rows)
+            if batch_number % LOG_EVERY_N_BATCHES == 0:
+                logger.info("Fetched %d rows so far", total_rows)
         
         cursor.close()
         
-        # Create DataFrame
-        df = pd.DataFrame(all_data, columns=column_names)
+        # Create DataFrame from the columns, skipping pandas' row-to-column transpose; the
+        # buffers are keyed by position so duplicate column names each keep their own values
+        df = pd.DataFrame(dict(enumerate(columns)))
+        df.columns = column_names
         
         logger.info(f"Successfully exported {len(df)} rows to DataFrame")
         return df
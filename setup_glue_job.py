@@ -5,22 +5,114 @@ import argparse
 import boto3
 import zipfile
 import re
-import boto3
+import functools
+import hashlib
+import importlib.util
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import subprocess
 import sys
 
-def get_aws_account_id():
+# Keep STS calls in the session's region instead of the global endpoint; set before
+# any client is created
+os.environ.setdefault("AWS_STS_REGIONAL_ENDPOINTS", "regional")
+
+# Repository root and the Terraform template every job is created from
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_PATH = os.path.join(BASE_PATH, 'job_template_dockerized')
+
+# One boto3 session and one client per service for the whole CLI run, so credentials
+# are resolved once no matter how many job names are passed
+@functools.lru_cache(maxsize=1)
+def _session():
+    return boto3.session.Session()
+
+@functools.lru_cache(maxsize=None)
+def _client(service, region=None):
+    return _session().client(service, region_name=region)
+
+# Account IDs from earlier runs, one file per credential set, reused for a day
+ACCOUNT_ID_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'siriusxm-pipeline')
+ACCOUNT_ID_CACHE_TTL = 24 * 60 * 60
+
+def _account_id_cache_path():
+    credentials = _session().get_credentials()
+    if credentials is None:
+        return None
+    # Key on a digest of the access key so switching credentials never reuses another
+    # account's ID, and the key itself is not written to disk
+    key = hashlib.sha256(credentials.access_key.encode()).hexdigest()[:16]
+    return os.path.join(ACCOUNT_ID_CACHE_DIR, f"account_id_{key}")
+
+def _lookup_account_id():
+    sts = _client('sts')
     try:
-        sts = boto3.client('sts')
         return sts.get_caller_identity()['Account']
+    except sts.exceptions.RegionDisabledException:
+        # STS is not activated in this region for the account, so use the global endpoint
+        global_sts = _session().client('sts', endpoint_url='https://sts.amazonaws.com')
+        return global_sts.get_caller_identity()['Account']
+
+@functools.lru_cache(maxsize=1)
+def get_aws_account_id():
+    account_id = os.environ.get('AWS_ACCOUNT_ID')
+    if account_id:
+        return account_id
+    try:
+        cache_path = _account_id_cache_path()
+        if cache_path and os.path.exists(cache_path) \
+                and time.time() - os.path.getmtime(cache_path) < ACCOUNT_ID_CACHE_TTL:
+            with open(cache_path) as f:
+                account_id = f.read().strip()
+            if account_id:
+                return account_id
+
+        account_id = _lookup_account_id()
+
+        if cache_path:
+            try:
+                os.makedirs(ACCOUNT_ID_CACHE_DIR, exist_ok=True)
+                with open(cache_path, 'w') as f:
+                    f.write(account_id)
+            except OSError as e:
+                print(f"Warning: could not cache AWS account ID: {e}")
+        return account_id
     except Exception as e:
         print(f"Error getting AWS account ID: {e}")
         return "ACCOUNT_ID"
 
+@functools.lru_cache(maxsize=None)
+def _read_template(template_path, file):
+    """
+    Returns a template file's bytes, read from disk once per process however many
+    jobs render it.
+    """
+    with open(os.path.join(template_path, file), 'rb') as f:
+        return f.read()
+
+# Template files each job renders itself instead of copying
+GENERATED_TEMPLATE_FILES = {'terraform.tfvars', 'terraform.tfbackend'}
+
+@functools.lru_cache(maxsize=1)
+def template_files():
+    """
+    Returns the names of the files to copy from the template directory, listed once
+    per process so a file added to the template is picked up without code changes.
+    """
+    with os.scandir(TEMPLATE_PATH) as entries:
+        return tuple(sorted(
+            entry.name for entry in entries
+            if entry.is_file() and entry.name not in GENERATED_TEMPLATE_FILES
+        ))
+
+# An empty ZIP file is just the 22-byte end-of-central-directory record
+EMPTY_ZIP = b'PK\x05\x06' + b'\x00' * 18
+
 def create_empty_zip(zip_path):
-    with zipfile.ZipFile(zip_path, 'w') as empty_zip:
-        pass  # Create an empty ZIP file
+    with open(zip_path, 'wb') as f:
+        f.write(EMPTY_ZIP)
 
 def ensure_setup_py(job_path, job_name='glue-job'):
     """
@@ -46,14 +138,63 @@ setup(
         print(f"setup.py already exists in {job_path}, skipping.")
 
 
+def _iter_files(folder):
+    # DirEntry caches its stat result, so the walk costs one scandir per directory
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path)
+            elif entry.is_file():
+                yield entry
+
 def create_utils_zip(src_folder, zip_path):
-    with zipfile.ZipFile(zip_path, 'w') as zipf:
-        for root, dirs, files in os.walk(src_folder):
-            for file in files:
-                file_path = os.path.join(root, file)
-                # This will keep 'utils/filename' structure in the zip
-                arcname = os.path.relpath(file_path, os.path.dirname(src_folder))
-                zipf.write(file_path, arcname)
+    src_folder = os.path.normpath(src_folder)
+    # This will keep 'utils/filename' structure in the zip
+    prefix_len = len(os.path.dirname(src_folder)) + 1 if os.path.dirname(src_folder) else 0
+    # Fast deflate keeps the artifact small without making compression the bottleneck
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+        for entry in _iter_files(src_folder):
+            zipf.write(entry.path, entry.path[prefix_len:])
+
+
+def hash_wheel_sources(job_dir):
+    """
+    Returns a sha256 over setup.py and every file under src/, in a stable order.
+    """
+    h = hashlib.sha256()
+    paths = [os.path.join(job_dir, "setup.py")]
+    for root, dirs, files in os.walk(os.path.join(job_dir, "src")):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        paths.extend(os.path.join(root, f) for f in sorted(files) if not f.endswith(".pyc"))
+    for path in paths:
+        h.update(os.path.relpath(path, job_dir).encode())
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+_BUILD_DEPS_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _ensure_build_deps():
+    """
+    Installs setuptools and wheel if missing. Runs once per process, even when
+    several jobs build wheels concurrently.
+    """
+    with _BUILD_DEPS_LOCK:
+        missing = [p for p in ['setuptools', 'wheel'] if importlib.util.find_spec(p) is None]
+        if not missing:
+            return
+        if importlib.util.find_spec('pip') is None:
+            try:
+                subprocess.check_call([sys.executable, "-m", "ensurepip", "--upgrade"])
+            except Exception as e:
+                print(f"Warning: ensurepip failed: {e}")
+        try:
+            subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", *missing])
+        except Exception as e:
+            print(f"Failed to install {', '.join(missing)}. Please install manually.")
+            raise
 
 
 def create_utils_wheel(job_dir, wheel_output_folder, job_name):
@@ -66,34 +207,35 @@ def create_utils_wheel(job_dir, wheel_output_folder, job_name):
     # Ensure wheel_output_folder exists
     os.makedirs(wheel_output_folder, exist_ok=True)
 
+    # Ensure setup.py exists in job_dir
+    setup_py = os.path.join(job_dir, "setup.py")
+    if not os.path.exists(setup_py):
+        ensure_setup_py(job_dir, job_name)
+
+    # Skip the build when the sources match the last wheel built into this folder
+    hash_path = os.path.join(wheel_output_folder, ".wheel_hash")
+    source_hash = hash_wheel_sources(job_dir)
+    has_wheel = any(name.endswith(".whl") for name in os.listdir(wheel_output_folder))
+    if has_wheel and os.path.exists(hash_path):
+        with open(hash_path) as f:
+            if f.read().strip() == source_hash:
+                print(f"Wheel in {wheel_output_folder} is up to date, skipping build.")
+                return
+
     # Clean up old build artifacts
     for artifact in ["build", "dist", "utils.egg-info"]:
         artifact_path = os.path.join(job_dir, artifact)
         if os.path.exists(artifact_path):
             shutil.rmtree(artifact_path)
 
-    # Check for setuptools and wheel, try to install if missing
-    for package in ['setuptools', 'wheel']:
-        if importlib.util.find_spec(package) is None:
-            try:
-                subprocess.check_call([sys.executable, "-m", "ensurepip", "--upgrade"])
-            except Exception as e:
-                print(f"Warning: ensurepip failed: {e}")
-            try:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", package])
-            except Exception as e:
-                print(f"Failed to install {package}. Please install it manually.")
-                raise
-
-    # Ensure setup.py exists in job_dir
-    setup_py = os.path.join(job_dir, "setup.py")
-    if not os.path.exists(setup_py):
-        ensure_setup_py(job_dir, job_name)
+    _ensure_build_deps()
 
     # Build the wheel
     subprocess.check_call([
         sys.executable, "setup.py", "bdist_wheel", "--dist-dir", wheel_output_folder
     ], cwd=job_dir)
+    with open(hash_path, "w") as f:
+        f.write(source_hash)
     print(f"Created .whl bundle in {wheel_output_folder}")
 
 
@@ -151,16 +293,21 @@ def create_utils_wheel(job_dir, wheel_output_folder, job_name):
 #     print(f"Created .whl bundle in {wheel_output_folder}")
 
 
+_BUCKET_RE = re.compile(r'[^a-zA-Z0-9-]')
+
+# Job names become directory names under jobs/ and are sanitized into bucket names
+_JOB_NAME_RE = re.compile(r'[A-Za-z0-9][A-Za-z0-9_-]*')
+
+@functools.lru_cache(maxsize=256)
 def generate_valid_bucket_name(job_name):
-    bucket_name = re.sub(r'[^a-zA-Z0-9-]', '-', job_name.lower())
+    bucket_name = _BUCKET_RE.sub('-', job_name.lower())
     if not bucket_name[0].isalnum():
         bucket_name = 'a' + bucket_name
     return f"{bucket_name[:59]}-utils"[:63]
 
 def get_aws_region():
     try:
-        session = boto3.session.Session()
-        return session.region_name
+        return _session().region_name
     except Exception as e:
         print(f"Error getting AWS region: {e}")
         return "YOUR_AWS_REGION"
@@ -182,23 +329,47 @@ dynamodb_table = "{dynamodb_table_name}"
     
     print(f"Created/Updated terraform.tfbackend for {job_name}")
 
-def setup_glue_job(job_name):
+UTILS_BUCKET_NAME = "talend-migration-utils-bucket"
+GLUE_ASSETS_BUCKET = "talend-migration-glue-assets-bucket"
+
+@functools.lru_cache(maxsize=None)
+def render_tfvars(aws_account_id):
+    """
+    Returns the terraform.tfvars template with its bucket and account placeholders
+    filled in. Only the job_name line differs between jobs, so this is rendered once
+    per account.
+    """
+    substitutions = {
+        'default-utils-bucket': UTILS_BUCKET_NAME,
+        'default-utils-requirements-bucket': UTILS_BUCKET_NAME,
+        'default-glue-assets-bucket': GLUE_ASSETS_BUCKET,
+        'ACCOUNT_ID': aws_account_id,
+    }
+    # Replace every placeholder in one pass, longest first so no placeholder
+    # matches inside a longer one
+    placeholder_re = re.compile('|'.join(map(re.escape, sorted(substitutions, key=len, reverse=True))))
+    tfvars_content = _read_template(TEMPLATE_PATH, 'terraform.tfvars').decode()
+    return placeholder_re.sub(lambda m: substitutions[m.group(0)], tfvars_content)
+
+def setup_glue_job(job_name, aws_account_id=None, aws_region=None):
     # Define paths
-    base_path = os.path.dirname(os.path.abspath(__file__))
-    template_path = os.path.join(base_path, 'job_template_dockerized')
-    job_path = os.path.join(base_path, 'jobs', job_name)
+    job_path = os.path.join(BASE_PATH, 'jobs', job_name)
 
     # Create job directory if it doesn't exist
     os.makedirs(job_path, exist_ok=True)
 
-    # Copy template files
-    for file in ['main.tf', 'variables.tf', 'terraform.tfvars', 'terraform.tfbackend','dockerfile','deploy.sh']:
-        shutil.copy(os.path.join(template_path, file), job_path)
+    # Copy the template directory. terraform.tfbackend is generated and terraform.tfvars
+    # is rendered from the template below, so neither is copied first only to be rewritten.
+    for file in template_files():
+        shutil.copy(os.path.join(TEMPLATE_PATH, file), job_path)
 
     print(f"Glue job '{job_name}' Terraform setup completed. Files copied to {job_path}")
 
-    # Get AWS account ID and region
-    aws_region = get_aws_region()
+    # Get AWS account ID and region, unless the caller already resolved them
+    if aws_region is None:
+        aws_region = get_aws_region()
+    if aws_account_id is None:
+        aws_account_id = get_aws_account_id()
 
     # Update terraform.tfbackend
     update_tfbackend(job_path, job_name, aws_region)
@@ -215,8 +386,9 @@ def setup_glue_job(job_name):
     }
 
     config_path = os.path.join(job_path, 'config.json')
+    # One write instead of json.dump's write per encoded chunk
     with open(config_path, 'w') as f:
-        json.dump(job_config, f, indent=2)
+        f.write(json.dumps(job_config, indent=2))
 
     print(f"Created config.json for {job_name}")
 
@@ -240,8 +412,7 @@ def setup_glue_job(job_name):
     #     create_utils_wheel(job_path, job_path, job_name)
 
 
-    job_path = os.path.join(base_path, 'jobs', job_name)
-    if os.path.exists(os.path.join(job_path, 'src')):
+    if os.path.exists(utils_src_folder):
         create_utils_wheel(job_path, job_path, job_name)
 
 
@@ -257,23 +428,11 @@ def setup_glue_job(job_name):
 
     # Update terraform.tfvars with job-specific values
     tfvars_path = os.path.join(job_path, 'terraform.tfvars')
-    with open(tfvars_path, 'r') as f:
-        tfvars_content = f.read()
-    
-    aws_account_id = get_aws_account_id()
-    utils_bucket_name = "talend-migration-utils-bucket"
-    glue_assets_bucket = "talend-migration-glue-assets-bucket"
-    updated_tfvars = tfvars_content.replace('default-utils-bucket', utils_bucket_name)
-    updated_tfvars = updated_tfvars.replace('default-utils-requirements-bucket', utils_bucket_name)
-    updated_tfvars = updated_tfvars.replace('default-glue-assets-bucket', glue_assets_bucket)
-    updated_tfvars = updated_tfvars.replace('ACCOUNT_ID', aws_account_id)
-    updated_tfvars += f'\njob_name = "{job_name}"\n'
-    
     with open(tfvars_path, 'w') as f:
-        f.write(updated_tfvars)
+        f.write(render_tfvars(aws_account_id) + f'\njob_name = "{job_name}"\n')
 
     print(f"Updated terraform.tfvars for {job_name}")
-    print(f"Utils bucket name: {utils_bucket_name}")
+    print(f"Utils bucket name: {UTILS_BUCKET_NAME}")
 
 # if __name__ == "__main__":
 #     parser = argparse.ArgumentParser(description="Set up a new AWS Glue job with Terraform configuration")
@@ -287,5 +446,25 @@ if __name__ == "__main__":
     parser.add_argument("job_names", nargs='+', help="Names of the Glue jobs to set up")
     args = parser.parse_args()
 
-    for job_name in args.job_names:
-        setup_glue_job(job_name)
+    # Reject bad names before any files are written or AWS is called
+    invalid_names = [name for name in args.job_names if not _JOB_NAME_RE.fullmatch(name)]
+    if invalid_names:
+        parser.error(f"invalid job name(s): {', '.join(invalid_names)}")
+
+    with ThreadPoolExecutor(max_workers=min(8, len(args.job_names))) as executor:
+        # Resolve the AWS account ID and region once for all jobs, on the pool and
+        # concurrently with each other and with the build dependency check
+        account_id_future = executor.submit(get_aws_account_id)
+        region_future = executor.submit(get_aws_region)
+
+        # Install missing wheel build dependencies once, before any worker needs them
+        _ensure_build_deps()
+
+        setup = functools.partial(
+            setup_glue_job,
+            aws_account_id=account_id_future.result(),
+            aws_region=region_future.result(),
+        )
+
+        # Each job has its own directory and wheel build, so jobs are set up concurrently
+        list(executor.map(setup, args.job_names))